@@ -8,6 +8,7 @@ All agents follow the same pattern:
 4. Return a structured verdict
 """
 
+import asyncio
 import os
 from abc import ABC, abstractmethod
 from typing import Any
@@ -75,28 +76,50 @@ class BaseAgent(ABC):
         
         return verdict
     
-    def _call_llm(self, messages: list[dict]) -> str:
-        """Call LLM with messages."""
-        langchain_messages = [
+    async def arun(self, application: dict) -> dict:
+        """
+        Async entry point: same verdict as run().
+        
+        Agents that split analyze() into _verdict_messages(application,
+        evidence) and _parse_verdict(response, application, evidence) get a
+        native async verdict call: evidence search runs in a worker thread
+        (the Qdrant client is synchronous) and the LLM call awaits the async
+        client, so agents running in parallel don't each hold a thread on
+        HTTP. Other agents run() in a worker thread.
+        """
+        if not (hasattr(self, "_verdict_messages") and hasattr(self, "_parse_verdict")):
+            return await asyncio.to_thread(self.run, application)
+        
+        evidence = await asyncio.to_thread(self.search_evidence, application)
+        response = await self._acall_llm_json(self._verdict_messages(application, evidence))
+        return self._parse_verdict(response, application, evidence)
+    
+    def _to_langchain_messages(self, messages: list[dict]) -> list:
+        """Convert role/content dicts to LangChain messages."""
+        return [
             SystemMessage(content=m["content"]) if m["role"] == "system" 
             else HumanMessage(content=m["content"])
             for m in messages
         ]
+    
+    def _call_llm(self, messages: list[dict]) -> str:
+        """Call LLM with messages."""
         # Add run_name for LangSmith tracing
         config = RunnableConfig(run_name=f"{self.name}_reasoning")
-        response = self.llm.invoke(langchain_messages, config=config)
+        response = self.llm.invoke(self._to_langchain_messages(messages), config=config)
         return response.content
     
     def _call_llm_json(self, messages: list[dict]) -> str:
         """Call LLM with JSON response format."""
-        langchain_messages = [
-            SystemMessage(content=m["content"]) if m["role"] == "system" 
-            else HumanMessage(content=m["content"])
-            for m in messages
-        ]
         # Add run_name for LangSmith tracing
         config = RunnableConfig(run_name=f"{self.name}_verdict")
-        response = self.llm_json.invoke(langchain_messages, config=config)
+        response = self.llm_json.invoke(self._to_langchain_messages(messages), config=config)
+        return response.content
+    
+    async def _acall_llm_json(self, messages: list[dict]) -> str:
+        """Async _call_llm_json."""
+        config = RunnableConfig(run_name=f"{self.name}_verdict")
+        response = await self.llm_json.ainvoke(self._to_langchain_messages(messages), config=config)
         return response.content
     
     def _format_application(self, application: dict) -> str:
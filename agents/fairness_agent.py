@@ -141,16 +141,15 @@ Be balanced. Your job is to ensure fairness, not to approve everyone."""
     
     def analyze(self, application: dict, evidence: list[dict]) -> dict:
         """Analyze the application for fair treatment."""
+        response = self._call_llm_json(self._verdict_messages(application, evidence))
+        return self._parse_verdict(response, application, evidence)
+    
+    def _verdict_messages(self, application: dict, evidence: list[dict]) -> list[dict]:
+        """Prompt for the fairness verdict."""
         app_text = self._format_application(application)
         evidence_text = self._format_evidence(evidence)
         
-        # Count approvals in evidence
-        approval_count = sum(
-            1 for e in evidence 
-            if e.get("payload", {}).get("outcome") == "APPROVED"
-        )
-        
-        messages = [
+        return [
             {"role": "system", "content": self.system_prompt},
             {"role": "user", "content": f"""Evaluate this application for fair treatment:
 
@@ -160,8 +159,14 @@ Be balanced. Your job is to ensure fairness, not to approve everyone."""
 
 Based on the evidence, provide your fairness assessment as JSON."""}
         ]
-        
-        response = self._call_llm_json(messages)
+    
+    def _parse_verdict(self, response: str, application: dict, evidence: list[dict]) -> dict:
+        """Build the fairness verdict from the LLM response."""
+        # Count approvals in evidence
+        approval_count = sum(
+            1 for e in evidence 
+            if e.get("payload", {}).get("outcome") == "APPROVED"
+        )
         
         try:
             verdict = json.loads(response)
@@ -156,15 +156,22 @@ Donne une nouvelle formulation de la question:"""}
             # Fallback: just add context
             return f"réglementation bancaire BCT {original_query}"
     
-    def search_evidence(self, query: str, rerank: bool = False) -> list[dict]:
+    def search_evidence(
+        self,
+        query: str,
+        rerank: bool = False,
+        query_embedding: tuple[list[float], list[int], list[float]] | None = None
+    ) -> list[dict]:
         """Search regulations collection for relevant chunks.
         
         Args:
             query: Search query text
             rerank: If True, use mxbai reranker for two-stage retrieval
+            query_embedding: Pre-computed (dense, sparse indices, sparse values)
+                for query, e.g. from embed_queries (optional)
         """
         # Compute embeddings once
-        dense_vec, sparse_idx, sparse_vals = embed_query(query)
+        dense_vec, sparse_idx, sparse_vals = query_embedding or embed_query(query)
         
         # Search for relevant regulation chunks
         response = search_regulations(
@@ -179,13 +186,20 @@ Donne une nouvelle formulation de la question:"""}
         
         return response.get("results", [])
     
-    def search_with_retry(self, query: str, rerank: bool = False) -> tuple[list[dict], list[str], int]:
+    def search_with_retry(
+        self,
+        query: str,
+        rerank: bool = False,
+        query_embedding: tuple[list[float], list[int], list[float]] | None = None
+    ) -> tuple[list[dict], list[str], int]:
         """
         Agentic search with retry and query reformulation.
         
         Args:
             query: Search query text
             rerank: If True, use mxbai reranker for two-stage retrieval
+            query_embedding: Pre-computed embedding of query (reformulated
+                queries are embedded as they come)
         
         Returns:
             (results, queries_tried, attempt_count)
@@ -195,7 +209,11 @@ Donne une nouvelle formulation de la question:"""}
         
         for attempt in range(1, MAX_RETRIEVAL_ATTEMPTS + 1):
             # Search with current query
-            results = self.search_evidence(current_query, rerank=rerank)
+            results = self.search_evidence(
+                current_query,
+                rerank=rerank,
+                query_embedding=query_embedding if current_query == query else None
+            )
             
             # Assess quality
             is_good, reason = self._assess_retrieval_quality(results)
@@ -142,16 +142,15 @@ Be thorough but fair. Your job is to find risk, not to reject everyone."""
     
     def analyze(self, application: dict, evidence: list[dict]) -> dict:
         """Analyze the application and evidence to produce a verdict."""
+        response = self._call_llm_json(self._verdict_messages(application, evidence))
+        return self._parse_verdict(response, application, evidence)
+    
+    def _verdict_messages(self, application: dict, evidence: list[dict]) -> list[dict]:
+        """Prompt for the risk verdict."""
         app_text = self._format_application(application)
         evidence_text = self._format_evidence(evidence)
         
-        # Count defaults in evidence
-        default_count = sum(
-            1 for e in evidence 
-            if e.get("payload", {}).get("outcome") in ["DEFAULT", "BANKRUPT", "REJECTED"]
-        )
-        
-        messages = [
+        return [
             {"role": "system", "content": self.system_prompt},
             {"role": "user", "content": f"""Analyze this application for credit risk:
 
@@ -161,8 +160,14 @@ Be thorough but fair. Your job is to find risk, not to reject everyone."""
 
 Based on the evidence, provide your risk assessment as JSON."""}
         ]
-        
-        response = self._call_llm_json(messages)
+    
+    def _parse_verdict(self, response: str, application: dict, evidence: list[dict]) -> dict:
+        """Build the risk verdict from the LLM response."""
+        # Count defaults in evidence
+        default_count = sum(
+            1 for e in evidence 
+            if e.get("payload", {}).get("outcome") in ["DEFAULT", "BANKRUPT", "REJECTED"]
+        )
         
         try:
             verdict = json.loads(response)
@@ -190,6 +190,11 @@ You are forward-looking. Consider not just current state, but future trajectory.
     
     def analyze(self, application: dict, evidence: list[dict]) -> dict:
         """Analyze the application for future trajectory."""
+        response = self._call_llm_json(self._verdict_messages(application, evidence))
+        return self._parse_verdict(response, application, evidence)
+    
+    def _verdict_messages(self, application: dict, evidence: list[dict]) -> list[dict]:
+        """Prompt for the trajectory verdict."""
         app_text = self._format_application(application)
         evidence_text = self._format_evidence(evidence)
         
@@ -202,7 +207,7 @@ You are forward-looking. Consider not just current state, but future trajectory.
         )
         failure_rate = default_count / len(evidence) if evidence else 0
         
-        messages = [
+        return [
             {"role": "system", "content": self.system_prompt},
             {"role": "user", "content": f"""Predict future trajectory for this application:
 
@@ -215,8 +220,10 @@ Historical Failure Rate in Similar Cases: {failure_rate:.0%}
 
 Based on this, predict the future outcome as JSON."""}
         ]
-        
-        response = self._call_llm_json(messages)
+    
+    def _parse_verdict(self, response: str, application: dict, evidence: list[dict]) -> dict:
+        """Build the trajectory verdict from the LLM response."""
+        pattern = self._identify_pattern(application, evidence)
         
         try:
             verdict = json.loads(response)
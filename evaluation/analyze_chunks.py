@@ -24,13 +24,17 @@ import sys
 import random
 import re
 from pathlib import Path
-from collections import Counter
-from typing import Literal
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Literal, NamedTuple
+
+import numpy as np
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
+from qdrant_client.http import models
 
 load_dotenv()
 
@@ -50,6 +54,27 @@ THRESHOLDS = {
     "max_orphan_rate": 0.10,         # Max 10% chunks with no context
 }
 
+# Only these payload fields are read by the analysis; skip the rest on the wire
+SAMPLE_PAYLOAD = models.PayloadSelectorInclude(include=["content", "article_ref"])
+
+# Boundary checks run on stripped content, so plain character tests suffice
+SENTENCE_START_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZÀÂÄÉÈÊËÏÎÔÙÛÜÇ[")  # Capital or "[" marker
+SENTENCE_END_CHARS = (".", "!", "?", ":", ";")
+
+# Precompiled patterns (compiled once, reused for every chunk).
+# They are matched against content.lower(), so they are written in lowercase
+# and compiled without re.IGNORECASE.
+STRUCTURAL_MARKER_NAMES = ("Article", "Art", "Section", "Chapitre", "Titre", "Circulaire")
+STRUCTURAL_MARKER_PATTERN = re.compile(
+    r'(article\s+\d+)'
+    r'|(art\.\s*\d+)'
+    r'|(section\s+\d+)'
+    r'|(chapitre\s+\d+)'
+    r'|(titre\s+[ivx]+)'
+    r'|(circulaire\s+n[°o]\s*\d+)'
+)
+MULTI_ARTICLE_PATTERN = re.compile(r'article\s+\d+')
+DEFINITION_PATTERN = re.compile(r'(signifie|désigne|s\'entend|est défini)')
 
 def get_qdrant_client() -> QdrantClient:
     """Get Qdrant client."""
@@ -60,204 +85,246 @@ def get_qdrant_client() -> QdrantClient:
     return QdrantClient(url=url, api_key=api_key, timeout=120)
 
 
-def sample_chunks(client: QdrantClient, collection: str, sample_size: int) -> list[dict]:
-    """Sample random chunks from collection."""
+class ChunkSample(NamedTuple):
+    """Sampled chunks stored column-wise: one list per payload field."""
+    ids: list
+    contents: list[str]
+    article_refs: list[str | None]
+
+
+def sample_chunks(client: QdrantClient, collection: str, sample_size: int) -> ChunkSample:
+    """
+    Sample random chunks from collection.
+    
+    Uses reservoir sampling (Algorithm R) over a single scroll of the whole
+    collection, so memory stays O(sample_size) and every chunk is equally
+    likely to be picked.
+    """
     # Get total count
     info = client.get_collection(collection)
     total = info.points_count
     
     print(f"Collection '{collection}' has {total:,} chunks")
     
-    # Scroll through and sample
-    all_points = []
+    reservoir = []
+    seen = 0
     offset = None
-    batch_size = 100
+    # Scroll pages are chained by offset, so they can't be fetched in parallel;
+    # large pages keep the number of round trips low instead.
+    batch_size = 1000
     
     print(f"Sampling {sample_size} chunks...")
     
-    while len(all_points) < min(sample_size * 2, total):
-        result = client.scroll(
+    while True:
+        points, offset = client.scroll(
             collection_name=collection,
             limit=batch_size,
             offset=offset,
-            with_payload=True
+            with_payload=SAMPLE_PAYLOAD,
+            with_vectors=False,
         )
-        points, offset = result
-        all_points.extend(points)
+        
+        for point in points:
+            if seen < sample_size:
+                reservoir.append(point)
+            else:
+                j = random.randrange(seen + 1)
+                if j < sample_size:
+                    reservoir[j] = point
+            seen += 1
         
         if offset is None:
             break
     
-    # Random sample
-    if len(all_points) > sample_size:
-        sampled = random.sample(all_points, sample_size)
-    else:
-        sampled = all_points
-    
-    return [{"id": p.id, "payload": p.payload} for p in sampled]
+    return ChunkSample(
+        ids=[p.id for p in reservoir],
+        contents=[p.payload.get("content", "") for p in reservoir],
+        article_refs=[p.payload.get("article_ref") for p in reservoir],
+    )
 
 
-def analyze_chunk_sizes(chunks: list[dict]) -> dict:
+def analyze_chunk_sizes(char_lengths: list[int], word_counts: list[int]) -> dict:
     """Analyze chunk size distribution."""
-    char_lengths = []
-    word_counts = []
+    chars = np.asarray(char_lengths, dtype=np.int64)
+    words = np.asarray(word_counts, dtype=np.int64)
     
-    for chunk in chunks:
-        content = chunk["payload"].get("content", "")
-        char_lengths.append(len(content))
-        word_counts.append(len(content.split()))
-    
-    char_lengths.sort()
+    # Only three order statistics are needed: introselect them in O(n)
+    # instead of sorting the whole sample.
+    n = chars.size
+    ranks = [n // 10, n // 2, int(n * 0.9)]
+    p10, median, p90 = np.partition(chars, ranks)[ranks]
     
     return {
-        "total_chunks": len(chunks),
+        "total_chunks": int(chars.size),
         "char_length": {
-            "min": min(char_lengths),
-            "max": max(char_lengths),
-            "mean": sum(char_lengths) / len(char_lengths),
-            "median": char_lengths[len(char_lengths) // 2],
-            "p10": char_lengths[len(char_lengths) // 10],
-            "p90": char_lengths[int(len(char_lengths) * 0.9)],
+            "min": int(chars.min()),
+            "max": int(chars.max()),
+            "mean": float(chars.mean()),
+            "median": int(median),
+            "p10": int(p10),
+            "p90": int(p90),
         },
         "word_count": {
-            "min": min(word_counts),
-            "max": max(word_counts),
-            "mean": sum(word_counts) / len(word_counts),
+            "min": int(words.min()),
+            "max": int(words.max()),
+            "mean": float(words.mean()),
         },
-        "too_short": sum(1 for c in char_lengths if c < THRESHOLDS["min_chunk_chars"]),
-        "too_long": sum(1 for c in char_lengths if c > THRESHOLDS["max_chunk_chars"]),
-        "in_ideal_range": sum(1 for c in char_lengths 
-                             if THRESHOLDS["ideal_chunk_chars_min"] <= c <= THRESHOLDS["ideal_chunk_chars_max"]),
+        "too_short": int((chars < THRESHOLDS["min_chunk_chars"]).sum()),
+        "too_long": int((chars > THRESHOLDS["max_chunk_chars"]).sum()),
+        "in_ideal_range": int(((chars >= THRESHOLDS["ideal_chunk_chars_min"])
+                               & (chars <= THRESHOLDS["ideal_chunk_chars_max"])).sum()),
     }
 
 
-def analyze_boundary_quality(chunks: list[dict]) -> dict:
-    """Check if chunks are cut mid-sentence."""
-    truncated_start = 0
-    truncated_end = 0
-    clean_boundaries = 0
+@lru_cache(maxsize=512)
+def classify_content(content: str) -> tuple[int, bool, bool]:
+    """
+    Regex-derived features of a chunk's text.
     
-    sentence_end_pattern = re.compile(r'[.!?:;]\s*$')
-    sentence_start_pattern = re.compile(r'^[A-ZÀÂÄÉÈÊËÏÎÔÙÛÜÇ]')  # Starts with capital
+    Cached on the full content: regulatory corpora repeat boilerplate chunks
+    (headers, circular openers), and those are only scanned once.
     
-    for chunk in chunks:
-        content = chunk["payload"].get("content", "").strip()
-        
-        if not content:
-            continue
-        
-        # Check start
-        starts_clean = bool(sentence_start_pattern.match(content)) or content.startswith("[") or content.startswith("Article")
-        
-        # Check end
-        ends_clean = bool(sentence_end_pattern.search(content))
-        
-        if not starts_clean:
-            truncated_start += 1
-        if not ends_clean:
-            truncated_end += 1
-        if starts_clean and ends_clean:
-            clean_boundaries += 1
+    Returns:
+        (structural marker group index or 0, is multi-topic, is definition)
+    """
+    # Case-fold once instead of once per IGNORECASE scan
+    content_lower = content.lower()
     
-    total = len(chunks)
+    marker = STRUCTURAL_MARKER_PATTERN.search(content_lower)
+    marker_index = marker.lastindex if marker else 0
     
-    return {
-        "truncated_start": truncated_start,
-        "truncated_start_rate": truncated_start / total if total else 0,
-        "truncated_end": truncated_end,
-        "truncated_end_rate": truncated_end / total if total else 0,
-        "clean_boundaries": clean_boundaries,
-        "clean_boundary_rate": clean_boundaries / total if total else 0,
-    }
+    # Cheap substring probe first: most chunks never mention "article"
+    multi_topic = False
+    if "article" in content_lower:
+        article_mentions = sum(1 for _ in MULTI_ARTICLE_PATTERN.finditer(content_lower))
+        multi_topic = article_mentions > 2
+    
+    is_definition = DEFINITION_PATTERN.search(content_lower) is not None
+    
+    return marker_index, multi_topic, is_definition
 
 
-def analyze_article_coverage(chunks: list[dict]) -> dict:
-    """Check if chunks preserve article/section references."""
-    article_patterns = [
-        r'Article\s+\d+',
-        r'Art\.\s*\d+',
-        r'Section\s+\d+',
-        r'Chapitre\s+\d+',
-        r'Titre\s+[IVX]+',
-        r'Circulaire\s+n[°o]\s*\d+',
-    ]
+def analyze_all(chunks: ChunkSample, workers: int = 1) -> dict:
+    """
+    Run every chunk analysis in a single pass over the sample.
+    
+    With workers > 1, the regex classification is sharded across a process
+    pool; this only pays off on large samples (thousands of chunks).
+    
+    Returns the size, boundary, article and coherence sections of the report.
+    """
+    total = len(chunks.ids)
     
+    # Size accumulators
+    char_lengths = []
+    word_counts = []
+    
+    # Boundary accumulators
+    truncated_start = 0
+    truncated_end = 0
+    clean_boundaries = 0
+    
+    # Article coverage accumulators
     has_article_ref = 0
     has_structural_marker = 0
     orphan_chunks = 0
+    # Tally per structural marker group; index 0 is "no marker"
+    marker_counts = [0] * (len(STRUCTURAL_MARKER_NAMES) + 1)
+    
+    # Semantic coherence accumulators
+    # - Multiple topics in one chunk (bad)
+    # - Chunk covers single concept (good)
+    multi_topic_chunks = 0
+    definition_chunks = 0
+    list_chunks = 0
     
-    article_types = Counter()
+    if workers > 1 and total:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            features = list(executor.map(
+                classify_content,
+                chunks.contents,
+                chunksize=max(1, total // (workers * 4)),
+            ))
+    else:
+        features = map(classify_content, chunks.contents)
     
-    for chunk in chunks:
-        content = chunk["payload"].get("content", "")
-        article_ref = chunk["payload"].get("article_ref")
+    for content, article_ref, (marker_index, multi_topic, is_definition) in zip(
+        chunks.contents, chunks.article_refs, features
+    ):
+        # --- Size ---
+        char_lengths.append(len(content))
+        word_counts.append(len(content.split()))
+        
+        # --- Boundaries (are chunks cut mid-sentence?) ---
+        stripped = content.strip()
+        if stripped:
+            starts_clean = stripped[0] in SENTENCE_START_CHARS
+            ends_clean = stripped.endswith(SENTENCE_END_CHARS)
+            
+            if not starts_clean:
+                truncated_start += 1
+            if not ends_clean:
+                truncated_end += 1
+            if starts_clean and ends_clean:
+                clean_boundaries += 1
         
+        # --- Article coverage ---
         if article_ref:
             has_article_ref += 1
         
         # Check for structural markers in content
-        has_marker = False
-        for pattern in article_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                has_marker = True
-                match = re.search(pattern, content, re.IGNORECASE)
-                if match:
-                    article_types[pattern.split("\\")[0]] += 1
-                break
+        has_marker = marker_index > 0
         
         if has_marker:
             has_structural_marker += 1
+            marker_counts[marker_index] += 1
         
-        # Orphan: no article ref and no markers
-        if not article_ref and not has_marker and len(content) < 200:
+        # Orphan: short chunk with no article ref and no markers
+        if not article_ref and len(content) < 200 and not has_marker:
             orphan_chunks += 1
-    
-    total = len(chunks)
-    
-    return {
-        "has_article_ref": has_article_ref,
-        "article_ref_rate": has_article_ref / total if total else 0,
-        "has_structural_marker": has_structural_marker,
-        "structural_marker_rate": has_structural_marker / total if total else 0,
-        "orphan_chunks": orphan_chunks,
-        "orphan_rate": orphan_chunks / total if total else 0,
-        "article_types": dict(article_types),
-    }
-
-
-def analyze_semantic_coherence(chunks: list[dict]) -> dict:
-    """Analyze semantic coherence of chunks."""
-    # Heuristics for semantic coherence:
-    # - Multiple topics in one chunk (bad)
-    # - Chunk covers single concept (good)
-    
-    multi_topic_chunks = 0
-    definition_chunks = 0
-    list_chunks = 0
-    
-    for chunk in chunks:
-        content = chunk["payload"].get("content", "")
         
+        # --- Semantic coherence ---
         # Detect multiple articles in one chunk (bad splitting)
-        article_mentions = len(re.findall(r'Article\s+\d+', content, re.IGNORECASE))
-        if article_mentions > 2:
+        if multi_topic:
             multi_topic_chunks += 1
         
         # Detect definition-like content
-        if re.search(r'(signifie|désigne|s\'entend|est défini)', content, re.IGNORECASE):
+        if is_definition:
             definition_chunks += 1
         
         # Detect list content
         if content.count('\n-') > 2 or content.count('\n•') > 2:
             list_chunks += 1
     
-    total = len(chunks)
-    
     return {
-        "multi_topic_chunks": multi_topic_chunks,
-        "multi_topic_rate": multi_topic_chunks / total if total else 0,
-        "definition_chunks": definition_chunks,
-        "list_chunks": list_chunks,
+        "size": analyze_chunk_sizes(char_lengths, word_counts),
+        "boundaries": {
+            "truncated_start": truncated_start,
+            "truncated_start_rate": truncated_start / total if total else 0,
+            "truncated_end": truncated_end,
+            "truncated_end_rate": truncated_end / total if total else 0,
+            "clean_boundaries": clean_boundaries,
+            "clean_boundary_rate": clean_boundaries / total if total else 0,
+        },
+        "articles": {
+            "has_article_ref": has_article_ref,
+            "article_ref_rate": has_article_ref / total if total else 0,
+            "has_structural_marker": has_structural_marker,
+            "structural_marker_rate": has_structural_marker / total if total else 0,
+            "orphan_chunks": orphan_chunks,
+            "orphan_rate": orphan_chunks / total if total else 0,
+            "article_types": {
+                name: count
+                for name, count in zip(STRUCTURAL_MARKER_NAMES, marker_counts[1:])
+                if count
+            },
+        },
+        "coherence": {
+            "multi_topic_chunks": multi_topic_chunks,
+            "multi_topic_rate": multi_topic_chunks / total if total else 0,
+            "definition_chunks": definition_chunks,
+            "list_chunks": list_chunks,
+        },
     }
 
 
@@ -336,82 +403,110 @@ def calculate_production_score(analysis: dict) -> dict:
     }
 
 
+REPORT_TEMPLATE = """
+{rule}
+CHUNKING STRATEGY DIAGNOSTIC REPORT
+{rule}
+
+📊 Sample Size: {total_chunks} chunks
+
+📏 CHUNK SIZE DISTRIBUTION
+{thin_rule}
+   Characters: min={char_min}, max={char_max}, mean={char_mean:.0f}
+   Words: min={word_min}, max={word_max}, mean={word_mean:.0f}
+   Too short (<100 chars): {too_short} ({too_short_rate:.1%})
+   Too long (>2000 chars): {too_long} ({too_long_rate:.1%})
+   In ideal range (300-1000): {in_ideal_range} ({in_ideal_rate:.1%})
+
+✂️ BOUNDARY QUALITY
+{thin_rule}
+   Clean boundaries: {clean_boundaries} ({clean_boundary_rate:.1%})
+   Truncated start: {truncated_start} ({truncated_start_rate:.1%})
+   Truncated end: {truncated_end} ({truncated_end_rate:.1%})
+
+📚 ARTICLE COVERAGE
+{thin_rule}
+   Has article reference: {has_article_ref} ({article_ref_rate:.1%})
+   Has structural marker: {has_structural_marker} ({structural_marker_rate:.1%})
+   Orphan chunks: {orphan_chunks} ({orphan_rate:.1%})
+
+🧠 SEMANTIC COHERENCE
+{thin_rule}
+   Multi-topic chunks: {multi_topic_chunks} ({multi_topic_rate:.1%})
+   Definition chunks: {definition_chunks}
+   List-style chunks: {list_chunks}
+
+{rule}
+PRODUCTION READINESS SCORE
+{rule}
+
+   🎯 Overall Score: {overall_score:.2f}/1.00
+   📊 Grade: {grade}
+
+   Component Scores:
+{component_lines}{issues_block}
+
+   {verdict}
+
+💡 RECOMMENDATIONS:{recommendations}"""
+
+
 def print_report(analysis: dict, verbose: bool = False):
     """Print formatted analysis report."""
-    print("\n" + "=" * 70)
-    print("CHUNKING STRATEGY DIAGNOSTIC REPORT")
-    print("=" * 70)
-    
-    print(f"\n📊 Sample Size: {analysis['size']['total_chunks']} chunks")
-    
-    # Size Distribution
-    print("\n📏 CHUNK SIZE DISTRIBUTION")
-    print("-" * 40)
     size = analysis["size"]
-    print(f"   Characters: min={size['char_length']['min']}, max={size['char_length']['max']}, mean={size['char_length']['mean']:.0f}")
-    print(f"   Words: min={size['word_count']['min']}, max={size['word_count']['max']}, mean={size['word_count']['mean']:.0f}")
-    print(f"   Too short (<100 chars): {size['too_short']} ({size['too_short']/size['total_chunks']:.1%})")
-    print(f"   Too long (>2000 chars): {size['too_long']} ({size['too_long']/size['total_chunks']:.1%})")
-    print(f"   In ideal range (300-1000): {size['in_ideal_range']} ({size['in_ideal_range']/size['total_chunks']:.1%})")
-    
-    # Boundary Quality
-    print("\n✂️ BOUNDARY QUALITY")
-    print("-" * 40)
     bounds = analysis["boundaries"]
-    print(f"   Clean boundaries: {bounds['clean_boundaries']} ({bounds['clean_boundary_rate']:.1%})")
-    print(f"   Truncated start: {bounds['truncated_start']} ({bounds['truncated_start_rate']:.1%})")
-    print(f"   Truncated end: {bounds['truncated_end']} ({bounds['truncated_end_rate']:.1%})")
-    
-    # Article Coverage
-    print("\n📚 ARTICLE COVERAGE")
-    print("-" * 40)
     articles = analysis["articles"]
-    print(f"   Has article reference: {articles['has_article_ref']} ({articles['article_ref_rate']:.1%})")
-    print(f"   Has structural marker: {articles['has_structural_marker']} ({articles['structural_marker_rate']:.1%})")
-    print(f"   Orphan chunks: {articles['orphan_chunks']} ({articles['orphan_rate']:.1%})")
-    
-    # Semantic Coherence
-    print("\n🧠 SEMANTIC COHERENCE")
-    print("-" * 40)
     coherence = analysis["coherence"]
-    print(f"   Multi-topic chunks: {coherence['multi_topic_chunks']} ({coherence['multi_topic_rate']:.1%})")
-    print(f"   Definition chunks: {coherence['definition_chunks']}")
-    print(f"   List-style chunks: {coherence['list_chunks']}")
-    
-    # Production Score
-    print("\n" + "=" * 70)
-    print("PRODUCTION READINESS SCORE")
-    print("=" * 70)
     score = analysis["score"]
-    print(f"\n   🎯 Overall Score: {score['overall_score']:.2f}/1.00")
-    print(f"   📊 Grade: {score['grade']}")
-    print(f"\n   Component Scores:")
+    total = size["total_chunks"]
+    
+    component_lines = []
     for name, val in score["component_scores"].items():
-        bar = "█" * int(val * 20) + "░" * (20 - int(val * 20))
-        print(f"      {name:25s} [{bar}] {val:.2f}")
+        filled = int(val * 20)
+        component_lines.append(f"      {name:25s} [{'█' * filled}{'░' * (20 - filled)}] {val:.2f}")
     
+    issues_block = ""
     if score["issues"]:
-        print("\n   ⚠️ Issues Found:")
-        for issue in score["issues"]:
-            print(f"      • {issue}")
+        issues_block = "\n\n   ⚠️ Issues Found:" + "".join(f"\n      • {issue}" for issue in score["issues"])
+    
+    recommendations = [
+        text for triggered, text in (
+            (size["too_short"] / total > 0.1, "Increase MIN_CHARACTERS_PER_CHUNK to filter tiny chunks"),
+            (bounds["truncated_end_rate"] > 0.15, "Use sentence-aware chunking to avoid mid-sentence splits"),
+            (articles["article_ref_rate"] < 0.7, "Improve article reference extraction in metadata"),
+            (coherence["multi_topic_rate"] > 0.1, "Reduce CHUNK_SIZE to avoid mixing multiple articles"),
+            (articles["orphan_rate"] > 0.1, "Add parent context (section title) to orphan chunks"),
+        ) if triggered
+    ]
     
-    if score["is_production_ready"]:
-        print("\n   ✅ VERDICT: Chunking strategy is PRODUCTION READY")
-    else:
-        print("\n   ❌ VERDICT: Chunking strategy NEEDS IMPROVEMENT")
-    
-    # Recommendations
-    print("\n💡 RECOMMENDATIONS:")
-    if size["too_short"] / size["total_chunks"] > 0.1:
-        print("   • Increase MIN_CHARACTERS_PER_CHUNK to filter tiny chunks")
-    if bounds["truncated_end_rate"] > 0.15:
-        print("   • Use sentence-aware chunking to avoid mid-sentence splits")
-    if articles["article_ref_rate"] < 0.7:
-        print("   • Improve article reference extraction in metadata")
-    if coherence["multi_topic_rate"] > 0.1:
-        print("   • Reduce CHUNK_SIZE to avoid mixing multiple articles")
-    if articles["orphan_rate"] > 0.1:
-        print("   • Add parent context (section title) to orphan chunks")
+    print(REPORT_TEMPLATE.format_map({
+        **bounds,
+        **articles,
+        **coherence,
+        "rule": "=" * 70,
+        "thin_rule": "-" * 40,
+        "total_chunks": total,
+        "char_min": size["char_length"]["min"],
+        "char_max": size["char_length"]["max"],
+        "char_mean": size["char_length"]["mean"],
+        "word_min": size["word_count"]["min"],
+        "word_max": size["word_count"]["max"],
+        "word_mean": size["word_count"]["mean"],
+        "too_short": size["too_short"],
+        "too_short_rate": size["too_short"] / total,
+        "too_long": size["too_long"],
+        "too_long_rate": size["too_long"] / total,
+        "in_ideal_range": size["in_ideal_range"],
+        "in_ideal_rate": size["in_ideal_range"] / total,
+        "overall_score": score["overall_score"],
+        "grade": score["grade"],
+        "component_lines": "\n".join(component_lines),
+        "issues_block": issues_block,
+        "verdict": ("✅ VERDICT: Chunking strategy is PRODUCTION READY"
+                    if score["is_production_ready"]
+                    else "❌ VERDICT: Chunking strategy NEEDS IMPROVEMENT"),
+        "recommendations": "".join(f"\n   • {text}" for text in recommendations),
+    }))
 
 
 def main():
@@ -420,6 +515,7 @@ def main():
     parser.add_argument("--sample", type=int, default=200, help="Number of chunks to sample")
     parser.add_argument("--verbose", action="store_true", help="Show sample chunks")
     parser.add_argument("--output", type=str, default=None, help="Output JSON path")
+    parser.add_argument("--workers", type=int, default=1, help="Processes for regex analysis (large samples)")
     args = parser.parse_args()
     
     print("=" * 70)
@@ -432,19 +528,14 @@ def main():
     # Sample chunks
     chunks = sample_chunks(client, args.collection, args.sample)
     
-    if not chunks:
+    if not chunks.ids:
         print("❌ No chunks found in collection")
         return
     
     # Run analyses
     print("\nAnalyzing chunk quality...")
     
-    analysis = {
-        "size": analyze_chunk_sizes(chunks),
-        "boundaries": analyze_boundary_quality(chunks),
-        "articles": analyze_article_coverage(chunks),
-        "coherence": analyze_semantic_coherence(chunks),
-    }
+    analysis = analyze_all(chunks, workers=args.workers)
     
     analysis["score"] = calculate_production_score(analysis)
     
@@ -14,11 +14,19 @@ Features:
 - Agent-specific test cases
 """
 
-import json
+import argparse
 import random
+import string
+from collections import Counter
+from dataclasses import dataclass
+from functools import partial
+from operator import attrgetter, itemgetter
 from pathlib import Path
 from typing import Literal
 
+import numpy as np
+import orjson
+
 # Paths
 DATA_DIR = Path(__file__).parent.parent / "data_generation" / "output"
 EVAL_DIR = Path(__file__).parent
@@ -108,80 +116,138 @@ MULTI_HOP_TEMPLATES = [
 ]
 
 
+def _compile_templates(templates: list[str]) -> tuple[tuple[str, frozenset[str]], ...]:
+    """Pair each template with the placeholder names it uses, parsed once at import."""
+    formatter = string.Formatter()
+    return tuple(
+        (template, frozenset(field for _, field, _, _ in formatter.parse(template) if field))
+        for template in templates
+    )
+
+
+COMPILED_CLIENT_TEMPLATES = {k: _compile_templates(v) for k, v in CLIENT_QUERY_TEMPLATES.items()}
+COMPILED_STARTUP_TEMPLATES = {k: _compile_templates(v) for k, v in STARTUP_QUERY_TEMPLATES.items()}
+COMPILED_ENTERPRISE_TEMPLATES = {k: _compile_templates(v) for k, v in ENTERPRISE_QUERY_TEMPLATES.items()}
+COMPILED_MULTI_HOP_TEMPLATES = _compile_templates(MULTI_HOP_TEMPLATES)
+
+
+def _column(records: list[dict], key: str, default=None, dtype=np.float64) -> np.ndarray:
+    """Extract one field of every record into a NumPy array (default=None means required)."""
+    if default is None:
+        values = (r[key] for r in records)
+    else:
+        values = (r.get(key, default) for r in records)
+    return np.fromiter(values, dtype=dtype, count=len(records))
+
+
+def _select(records: list[dict], mask: np.ndarray) -> list[dict]:
+    """Records where the boolean mask is set, in original order."""
+    return [records[i] for i in np.flatnonzero(mask)]
+
+
+def _group_ids(records: list[dict], key: str, id_key: str) -> dict[str, list[str]]:
+    """Index record IDs by a categorical field (first-seen order, empty values skipped)."""
+    groups = {}
+    for record in records:
+        value = record.get(key)
+        if value:
+            groups.setdefault(value, []).append(record[id_key])
+    return groups
+
+
 # =============================================================================
 # EVALUATION CASE GENERATOR
 # =============================================================================
+@dataclass(slots=True)
+class EvalCase:
+    """A single evaluation case (serialized natively by orjson)."""
+    query: str
+    expected_ids: list[str]
+    collection: str
+    case_type: Literal["retrieval", "reasoning", "decision", "fairness"]
+    difficulty: Literal["easy", "medium", "hard"]
+    is_negative: bool = False  # If True, these IDs should NOT be retrieved
+    agent: str | None = None  # Which agent this tests (risk, fairness, trajectory, or None for retrieval)
+    reasoning: str = ""
+
+
 class EvaluationGenerator:
     def __init__(self):
         self.clients = []
         self.startups = []
         self.enterprises = []
-        self.eval_cases = []
+        self.eval_cases: list[EvalCase] = []
     
     def load_data(self):
         """Load generated data."""
-        with open(DATA_DIR / "clients.json") as f:
-            self.clients = json.load(f)
-        with open(DATA_DIR / "startups.json") as f:
-            self.startups = json.load(f)
-        with open(DATA_DIR / "enterprises.json") as f:
-            self.enterprises = json.load(f)
+        self.clients = orjson.loads((DATA_DIR / "clients.json").read_bytes())
+        self.startups = orjson.loads((DATA_DIR / "startups.json").read_bytes())
+        self.enterprises = orjson.loads((DATA_DIR / "enterprises.json").read_bytes())
         
         # Filter to test split only
         self.test_clients = [c for c in self.clients if c.get("split") == "test"]
         self.test_startups = [s for s in self.startups if s.get("split") == "test"]
         self.test_enterprises = [e for e in self.enterprises if e.get("split") == "test"]
         
-        print(f"Loaded: {len(self.test_clients)} test clients, {len(self.test_startups)} test startups, {len(self.test_enterprises)} test enterprises")
-    
-    def _create_case(
-        self,
-        query: str,
-        expected_ids: list[str],
-        collection: str,
-        case_type: Literal["retrieval", "reasoning", "decision", "fairness"],
-        difficulty: Literal["easy", "medium", "hard"],
-        is_negative: bool = False,
-        agent: str | None = None,
-        reasoning: str = ""
-    ) -> dict:
-        """Create a single evaluation case."""
-        return {
-            "query": query,
-            "expected_ids": expected_ids,
-            "collection": collection,
-            "case_type": case_type,
-            "difficulty": difficulty,
-            "is_negative": is_negative,  # If True, these IDs should NOT be retrieved
-            "agent": agent,  # Which agent this tests (risk, fairness, trajectory, or None for retrieval)
-            "reasoning": reasoning
+        # Single-condition group masks over the test split, computed once and
+        # combined with & / | by the case generators
+        client_missed = _column(self.test_clients, "missed_payments_last_12m", dtype=np.int64)
+        startup_burn = _column(self.test_startups, "burn_rate_monthly", 0)
+        startup_burn_multiple = _column(self.test_startups, "burn_multiple", 0)
+        startup_runway = _column(self.test_startups, "runway_months", 0)
+        startup_vc = _column(self.test_startups, "vc_backing", False, dtype=bool)
+        enterprise_z_score = _column(self.test_enterprises, "altman_z_score", 0)
+        enterprise_lawsuits = _column(self.test_enterprises, "legal_lawsuits_active", 0)
+        
+        self.masks = {
+            "client_missed_3plus": client_missed >= 3,
+            "client_no_missed": client_missed == 0,
+            "startup_burn_over_100k": startup_burn > 100000,
+            "startup_burn_under_50k": startup_burn < 50000,
+            "startup_burn_multiple_over_3": startup_burn_multiple > 3.0,
+            "startup_burn_multiple_over_5": startup_burn_multiple > 5.0,
+            "startup_runway_over_18": startup_runway > 18,
+            "startup_no_vc": ~startup_vc,
+            "enterprise_distressed": enterprise_z_score < 1.8,
+            "enterprise_healthy": enterprise_z_score > 3.0,
+            "enterprise_lawsuits_2plus": enterprise_lawsuits >= 2,
+            "enterprise_lawsuits_3plus": enterprise_lawsuits >= 3,
         }
+        
+        self.client_ids = np.array([c["client_id"] for c in self.test_clients], dtype=object)
+        self.startup_ids = np.array([s["startup_id"] for s in self.test_startups], dtype=object)
+        self.enterprise_ids = np.array([e["enterprise_id"] for e in self.test_enterprises], dtype=object)
+        
+        print(f"Loaded: {len(self.test_clients)} test clients, {len(self.test_startups)} test startups, {len(self.test_enterprises)} test enterprises")
     
     def generate_client_cases(self):
         """Generate evaluation cases for clients."""
+        cases = []
+        client_case = partial(EvalCase, collection="clients_v2")
+        
         # Define groups
-        high_risk_clients = [c for c in self.test_clients if c["missed_payments_last_12m"] >= 3]
-        low_risk_clients = [c for c in self.test_clients if c["missed_payments_last_12m"] == 0]
+        high_risk_mask = self.masks["client_missed_3plus"]
+        low_risk_mask = self.masks["client_no_missed"]
+        
+        high_risk_clients = _select(self.test_clients, high_risk_mask)
         
-        high_risk_ids = [c["client_id"] for c in high_risk_clients]
-        low_risk_ids = [c["client_id"] for c in low_risk_clients]
+        high_risk_ids = self.client_ids[high_risk_mask].tolist()
+        low_risk_ids = self.client_ids[low_risk_mask].tolist()
         
         # 1. Broad Category Queries (High Recall expected)
-        for template in CLIENT_QUERY_TEMPLATES["high_risk"]:
-            self.eval_cases.append(self._create_case(
+        for template, _ in COMPILED_CLIENT_TEMPLATES["high_risk"]:
+            cases.append(client_case(
                 query=template,
                 expected_ids=high_risk_ids,  # Expect ANY/ALL of these
-                collection="clients_v2",
                 case_type="retrieval",
                 difficulty="easy",
                 reasoning="Broad query for high-risk clients (missed payments >= 3)"
             ))
             
-        for template in CLIENT_QUERY_TEMPLATES["low_risk"]:
-            self.eval_cases.append(self._create_case(
+        for template, _ in COMPILED_CLIENT_TEMPLATES["low_risk"]:
+            cases.append(client_case(
                 query=template,
                 expected_ids=low_risk_ids,
-                collection="clients_v2",
                 case_type="retrieval",
                 difficulty="easy",
                 reasoning="Broad query for low-risk clients (clean history)"
@@ -190,190 +256,208 @@ class EvaluationGenerator:
         # 2. Specific Item Queries (Precision expected)
         # Select a few specific clients to test similarity search
         for client in high_risk_clients[:5]:
-            self.eval_cases.append(self._create_case(
+            cases.append(client_case(
                 query=f"Assess credit risk for profile similar to {client['client_id']}",
                 expected_ids=[client["client_id"]],
-                collection="clients_v2",
                 case_type="reasoning",
                 difficulty="medium",
                 agent="risk_agent",
                 reasoning=f"Specific retrieval for {client['client_id']}"
             ))
+        
+        self.eval_cases.extend(cases)
 
     def generate_startup_cases(self):
         """Generate evaluation cases for startups."""
+        cases = []
+        startup_case = partial(EvalCase, collection="startups_v2", case_type="retrieval")
+        
         # Define groups
-        high_risk_startups = [s for s in self.test_startups if s.get("burn_rate_monthly", 0) > 100000 or s.get("burn_multiple", 0) > 5.0]
-        sustainable_startups = [s for s in self.test_startups if s.get("burn_rate_monthly", 0) < 50000 and s.get("runway_months", 0) > 18]
+        high_risk_mask = self.masks["startup_burn_over_100k"] | self.masks["startup_burn_multiple_over_5"]
+        sustainable_mask = self.masks["startup_burn_under_50k"] & self.masks["startup_runway_over_18"]
         
-        high_risk_ids = [s["startup_id"] for s in high_risk_startups]
-        sustainable_ids = [s["startup_id"] for s in sustainable_startups]
+        high_risk_startups = _select(self.test_startups, high_risk_mask)
+        sustainable_startups = _select(self.test_startups, sustainable_mask)
+        
+        high_risk_ids = self.startup_ids[high_risk_mask].tolist()
+        sustainable_ids = self.startup_ids[sustainable_mask].tolist()
+        
+        # Sector -> IDs, built once per group instead of once per template
+        high_risk_by_sector = _group_ids(high_risk_startups, "sector", "startup_id")
+        sustainable_by_sector = _group_ids(sustainable_startups, "sector", "startup_id")
         
         # Broad Cases
-        for template in STARTUP_QUERY_TEMPLATES["high_risk"]:
-            if "{sector}" in template:
-                sectors = {s.get("sector") for s in high_risk_startups if s.get("sector")}
-                for sector in list(sectors)[:3]:
-                    sector_ids = [s["startup_id"] for s in high_risk_startups if s.get("sector") == sector]
-                    if sector_ids:
-                        self.eval_cases.append(self._create_case(
-                            query=template.format(sector=sector),
-                            expected_ids=sector_ids,
-                            collection="startups_v2",
-                            case_type="retrieval",
-                            difficulty="medium",
-                            reasoning=f"High risk startups in {sector}"
-                        ))
+        for template, fields in COMPILED_STARTUP_TEMPLATES["high_risk"]:
+            if "sector" in fields:
+                for sector, sector_ids in list(high_risk_by_sector.items())[:3]:
+                    cases.append(startup_case(
+                        query=template.format(sector=sector),
+                        expected_ids=sector_ids,
+                        difficulty="medium",
+                        reasoning=f"High risk startups in {sector}"
+                    ))
             else:
-                self.eval_cases.append(self._create_case(
+                cases.append(startup_case(
                     query=template,
                     expected_ids=high_risk_ids,
-                    collection="startups_v2",
-                    case_type="retrieval",
                     difficulty="easy",
                     reasoning="Broad query for high burn rate startups"
                 ))
 
-        for template in STARTUP_QUERY_TEMPLATES["low_risk"]:
-            if "{sector}" in template:
-                sectors = {s.get("sector") for s in sustainable_startups if s.get("sector")}
-                for sector in list(sectors)[:3]:
-                    sector_ids = [s["startup_id"] for s in sustainable_startups if s.get("sector") == sector]
-                    if sector_ids:
-                         self.eval_cases.append(self._create_case(
-                            query=template.format(sector=sector),
-                            expected_ids=sector_ids,
-                            collection="startups_v2",
-                            case_type="retrieval",
-                            difficulty="medium",
-                            reasoning=f"Sustainable startups in {sector}"
-                        ))
+        for template, fields in COMPILED_STARTUP_TEMPLATES["low_risk"]:
+            if "sector" in fields:
+                for sector, sector_ids in list(sustainable_by_sector.items())[:3]:
+                    cases.append(startup_case(
+                        query=template.format(sector=sector),
+                        expected_ids=sector_ids,
+                        difficulty="medium",
+                        reasoning=f"Sustainable startups in {sector}"
+                    ))
             else:
-                self.eval_cases.append(self._create_case(
+                cases.append(startup_case(
                     query=template,
                     expected_ids=sustainable_ids,
-                    collection="startups_v2",
-                    case_type="retrieval",
                     difficulty="easy",
                     reasoning="Broad query for sustainable startups"
                 ))
+        
+        self.eval_cases.extend(cases)
     
     def generate_enterprise_cases(self):
         """Generate evaluation cases for enterprises."""
+        cases = []
+        enterprise_case = partial(EvalCase, collection="enterprises_v2", case_type="retrieval")
+        
         # Distressed (Z-Score < 1.8)
-        distressed_enterprises = [e for e in self.test_enterprises if e.get("altman_z_score", 0) < 1.8]
-        healthy_enterprises = [e for e in self.test_enterprises if e.get("altman_z_score", 0) > 3.0]
-        legal_risk_enterprises = [e for e in self.test_enterprises if e.get("legal_lawsuits_active", 0) >= 3]
+        distressed_mask = self.masks["enterprise_distressed"]
+        healthy_mask = self.masks["enterprise_healthy"]
+        legal_risk_mask = self.masks["enterprise_lawsuits_3plus"]
         
-        distressed_ids = [e["enterprise_id"] for e in distressed_enterprises]
-        healthy_ids = [e["enterprise_id"] for e in healthy_enterprises]
-        legal_risk_ids = [e["enterprise_id"] for e in legal_risk_enterprises]
+        distressed_enterprises = _select(self.test_enterprises, distressed_mask)
+        
+        distressed_ids = self.enterprise_ids[distressed_mask].tolist()
+        healthy_ids = self.enterprise_ids[healthy_mask].tolist()
+        legal_risk_ids = self.enterprise_ids[legal_risk_mask].tolist()
+        
+        # Industry -> IDs, built once instead of once per template
+        distressed_by_industry = _group_ids(distressed_enterprises, "industry_code", "enterprise_id")
         
         # Broad Cases
-        for template in ENTERPRISE_QUERY_TEMPLATES["distress"]:
-            if "{industry}" in template:
-                industries = {e.get("industry_code") for e in distressed_enterprises if e.get("industry_code")}
-                for ind in list(industries)[:3]:
-                    ind_ids = [e["enterprise_id"] for e in distressed_enterprises if e.get("industry_code") == ind]
-                    if ind_ids:
-                        self.eval_cases.append(self._create_case(
-                            query=template.format(industry=ind),
-                            expected_ids=ind_ids,
-                            collection="enterprises_v2",
-                            case_type="retrieval",
-                            difficulty="medium",
-                            reasoning=f"Distressed enterprises in {ind}"
-                        ))
+        for template, fields in COMPILED_ENTERPRISE_TEMPLATES["distress"]:
+            if "industry" in fields:
+                for ind, ind_ids in list(distressed_by_industry.items())[:3]:
+                    cases.append(enterprise_case(
+                        query=template.format(industry=ind),
+                        expected_ids=ind_ids,
+                        difficulty="medium",
+                        reasoning=f"Distressed enterprises in {ind}"
+                    ))
             else:
-               self.eval_cases.append(self._create_case(
+               cases.append(enterprise_case(
                     query=template,
                     expected_ids=distressed_ids,
-                    collection="enterprises_v2",
-                    case_type="retrieval",
                     difficulty="easy",
                     reasoning="Broad query for distressed enterprises"
                 ))
                 
-        for template in ENTERPRISE_QUERY_TEMPLATES["healthy"]:
-               self.eval_cases.append(self._create_case(
-                    query=template.format(industry="General") if "{industry}" in template else template,
+        for template, fields in COMPILED_ENTERPRISE_TEMPLATES["healthy"]:
+               cases.append(enterprise_case(
+                    query=template.format(industry="General") if "industry" in fields else template,
                     expected_ids=healthy_ids,
-                    collection="enterprises_v2",
-                    case_type="retrieval",
                     difficulty="easy",
                     reasoning="Broad query for healthy enterprises"
                 ))
                 
-        for template in ENTERPRISE_QUERY_TEMPLATES["legal_risk"]:
-               self.eval_cases.append(self._create_case(
+        for template, _ in COMPILED_ENTERPRISE_TEMPLATES["legal_risk"]:
+               cases.append(enterprise_case(
                     query=template,
                     expected_ids=legal_risk_ids,
-                    collection="enterprises_v2",
-                    case_type="retrieval",
                     difficulty="medium",
                     reasoning="Query for enterprises with legal risk"
                 ))
+        
+        self.eval_cases.extend(cases)
                 
     def generate_multi_hop_cases(self):
         """Generate complex multi-condition queries."""
+        cases = []
+        multi_hop_case = partial(EvalCase, case_type="retrieval", difficulty="hard")
+        
         # Distressed + Legal Risk
-        complex_distress = [
-            e for e in self.test_enterprises 
-            if e.get("altman_z_score", 0) < 1.8 and e.get("legal_lawsuits_active", 0) >= 2
-        ]
-        complex_distress_ids = [e["enterprise_id"] for e in complex_distress]
+        complex_distress_ids = self.enterprise_ids[
+            self.masks["enterprise_distressed"] & self.masks["enterprise_lawsuits_2plus"]
+        ].tolist()
         
         if complex_distress_ids:
             query = f"Find companies in financial distress with significant legal exposure"
-            self.eval_cases.append(self._create_case(
+            cases.append(multi_hop_case(
                 query=query,
                 expected_ids=complex_distress_ids,
                 collection="enterprises_v2",
-                case_type="retrieval",
-                difficulty="hard",
                 reasoning=f"Multi-hop: Low Z-Score AND >2 lawsuits"
             ))
             
         # High burn + No VC (Bootstrapped risk)
-        no_vc_burn = [
-            s for s in self.test_startups
-            if s.get("burn_multiple", 0) > 3.0 and not s.get("vc_backing", False)
-        ]
-        no_vc_burn_ids = [s["startup_id"] for s in no_vc_burn]
+        no_vc_burn_ids = self.startup_ids[
+            self.masks["startup_burn_multiple_over_3"] & self.masks["startup_no_vc"]
+        ].tolist()
         
         if no_vc_burn_ids:
             query = f"Find bootstrapped startups with cash flow problems"
-            self.eval_cases.append(self._create_case(
+            cases.append(multi_hop_case(
                 query=query,
                 expected_ids=no_vc_burn_ids,
                 collection="startups_v2",
-                case_type="retrieval",
-                difficulty="hard",
                 reasoning=f"Multi-hop: No VC AND high burn multiple"
             ))
+        
+        self.eval_cases.extend(cases)
     
     def generate_fairness_cases(self):
         """Generate fairness test cases (same profile → same decision)."""
-        # Find pairs of similar clients
-        for i, c1 in enumerate(self.test_clients):
-            for c2 in self.test_clients[i+1:]:
-                # If they have similar DTI and missed payments, outcome should be similar
-                dti_diff = abs(c1["debt_to_income_ratio"] - c2["debt_to_income_ratio"])
-                payments_diff = abs(c1["missed_payments_last_12m"] - c2["missed_payments_last_12m"])
-                
-                if dti_diff < 0.05 and payments_diff == 0:
-                    self.eval_cases.append(self._create_case(
-                        query=f"Compare treatment of {c1['client_id']} vs {c2['client_id']}",
-                        expected_ids=[c1["client_id"], c2["client_id"]],
-                        collection="clients_v2",
-                        case_type="fairness",
-                        difficulty="hard",
-                        agent="fairness_agent",
-                        reasoning=f"Similar profiles (DTI diff: {dti_diff:.2f}, payments diff: {payments_diff}) should get consistent treatment"
-                    ))
+        cases = []
+        
+        # Similar profiles: same missed payments and DTI within 0.05.
+        # Bucket by missed payments, sort each bucket by DTI and sweep a window
+        # instead of comparing every pair of clients.
+        buckets = {}
+        for index, client in enumerate(self.test_clients):
+            buckets.setdefault(client["missed_payments_last_12m"], []).append(
+                (client["debt_to_income_ratio"], index)
+            )
+        
+        pairs = []
+        for bucket in buckets.values():
+            bucket.sort(key=itemgetter(0))
+            for left, (dti, i) in enumerate(bucket):
+                for other_dti, j in bucket[left + 1:]:
+                    if other_dti - dti >= 0.05:
+                        break
+                    pairs.append((i, j) if i < j else (j, i))
+        
+        # Keep the original client ordering of the generated cases
+        pairs.sort()
+        
+        # Hot path (one case per similar pair): positional construction
+        for i, j in pairs:
+            c1 = self.test_clients[i]
+            c2 = self.test_clients[j]
+            dti_diff = abs(c1["debt_to_income_ratio"] - c2["debt_to_income_ratio"])
+            cases.append(EvalCase(
+                f"Compare treatment of {c1['client_id']} vs {c2['client_id']}",
+                [c1["client_id"], c2["client_id"]],
+                "clients_v2",
+                "fairness",
+                "hard",
+                False,
+                "fairness_agent",
+                f"Similar profiles (DTI diff: {dti_diff:.2f}, payments diff: 0) should get consistent treatment"
+            ))
+        
+        self.eval_cases.extend(cases)
     
-    def generate_all(self):
-        """Generate all evaluation cases."""
+    def generate_all(self, pretty: bool = False):
+        """Generate all evaluation cases and save them (compact unless pretty)."""
         self.load_data()
         
         print("\nGenerating evaluation cases...")
@@ -384,17 +468,10 @@ class EvaluationGenerator:
         self.generate_fairness_cases()
         
         # Summary
-        by_type = {}
-        by_difficulty = {}
-        by_collection = {}
-        negative_count = 0
-        
-        for case in self.eval_cases:
-            by_type[case["case_type"]] = by_type.get(case["case_type"], 0) + 1
-            by_difficulty[case["difficulty"]] = by_difficulty.get(case["difficulty"], 0) + 1
-            by_collection[case["collection"]] = by_collection.get(case["collection"], 0) + 1
-            if case["is_negative"]:
-                negative_count += 1
+        by_type = Counter(map(attrgetter("case_type"), self.eval_cases))
+        by_difficulty = Counter(map(attrgetter("difficulty"), self.eval_cases))
+        by_collection = Counter(map(attrgetter("collection"), self.eval_cases))
+        negative_count = sum(map(attrgetter("is_negative"), self.eval_cases))
         
         print(f"\n✓ Generated {len(self.eval_cases)} evaluation cases")
         print(f"\nBy Type:")
@@ -409,14 +486,19 @@ class EvaluationGenerator:
         print(f"\nNegative Examples: {negative_count}")
         
         # Save
-        with open(OUTPUT_FILE, "w") as f:
-            json.dump(self.eval_cases, f, indent=2)
+        # Compact by default: the dataset is read by scripts, not people
+        option = orjson.OPT_INDENT_2 if pretty else None
+        OUTPUT_FILE.write_bytes(orjson.dumps(self.eval_cases, option=option))
         print(f"\n✓ Saved to {OUTPUT_FILE}")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate the golden evaluation dataset")
+    parser.add_argument("--pretty", action="store_true", help="Indent the output JSON for reading")
+    args = parser.parse_args()
+    
     generator = EvaluationGenerator()
-    generator.generate_all()
+    generator.generate_all(pretty=args.pretty)
 
 
 if __name__ == "__main__":
@@ -17,17 +17,19 @@ Usage:
 """
 
 import argparse
+import asyncio
 import json
 import os
 import random
 import sys
+from collections import defaultdict, deque
 from pathlib import Path
-from typing import Literal
+from typing import Iterator, Literal
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 from tqdm import tqdm
 
 load_dotenv()
@@ -42,8 +44,9 @@ QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 COLLECTION_NAME = "regulations_v4"
 
 # OpenAI for generation
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 GENERATION_MODEL = "gpt-4o-mini"  # Cost-effective, with strict quality validation
+GENERATION_CONCURRENCY = 20  # Worker tasks, one chat completion request in flight each
 
 # Target distribution (scaled for 30 pairs default)
 TARGET_DISTRIBUTION = {
@@ -60,36 +63,27 @@ TARGET_DISTRIBUTION = {
 # =============================================================================
 # CHUNK SAMPLING
 # =============================================================================
-def get_sample_chunks(limit: int = 200) -> list[dict]:
-    """
-    Sample diverse chunks from Qdrant regulations collection.
-    Stratifies by page number to ensure coverage across document.
-    """
-    from qdrant_client import QdrantClient
-    
-    print(f"Connecting to Qdrant: {QDRANT_URL[:40]}...")
-    qdrant = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY, timeout=60)
+def iter_chunks(qdrant) -> Iterator[dict]:
+    """Stream regulation chunks from Qdrant, one dict per point, page by page."""
+    from qdrant_client.http import models
     
-    # Get total count
-    total_count = qdrant.count(COLLECTION_NAME).count
-    print(f"✓ Collection has {total_count} chunks")
-    
-    # Scroll through collection to get representative samples
-    chunks = []
     offset = None
     
-    while len(chunks) < limit:
+    while True:
         results, offset = qdrant.scroll(
             collection_name=COLLECTION_NAME,
-            limit=50,
+            limit=256,
             offset=offset,
-            with_payload=True,
+            with_payload=models.PayloadSelectorInclude(include=[
+                "chunk_id", "content", "page_number",
+                "article_ref", "section_title", "chunk_type",
+            ]),
             with_vectors=False
         )
         
         for point in results:
             payload = point.payload
-            chunks.append({
+            yield {
                 "id": point.id,
                 "chunk_id": payload.get("chunk_id", ""),
                 "content": payload.get("content", ""),
@@ -97,12 +91,30 @@ def get_sample_chunks(limit: int = 200) -> list[dict]:
                 "article_ref": payload.get("article_ref"),
                 "section_title": payload.get("section_title"),
                 "chunk_type": payload.get("chunk_type", "text"),
-            })
+            }
         
         if offset is None:
             break
+
+
+def get_sample_chunks(limit: int = 200) -> list[dict]:
+    """
+    Sample diverse chunks from Qdrant regulations collection.
+    Stratifies by page number to ensure coverage across document.
+    
+    The whole collection is streamed once; each (page range, has article)
+    stratum keeps a reservoir sample, so memory is bounded by the sample size
+    rather than the collection size.
+    """
+    from qdrant_client import QdrantClient
+    
+    print(f"Connecting to Qdrant: {QDRANT_URL[:40]}...")
+    # gRPC returns protobuf payloads instead of JSON for the full-collection scroll
+    qdrant = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY, prefer_grpc=True, timeout=60)
     
-    print(f"✓ Retrieved {len(chunks)} chunks")
+    # Get total count
+    total_count = qdrant.count(COLLECTION_NAME).count
+    print(f"✓ Collection has {total_count} chunks")
     
     # Stratified sampling by page ranges
     # Divide document into sections and sample from each
@@ -115,21 +127,48 @@ def get_sample_chunks(limit: int = 200) -> list[dict]:
         (501, 600),
     ]
     
-    sampled = []
     # Need ~3x chunks for generation failures + validation rejections
     per_range = max(15, (limit * 4) // len(page_ranges))
+    # Take up to 70% from chunks with articles, the rest without
+    capacity = {True: int(per_range * 0.7), False: per_range}
+    
+    # Reservoir (Algorithm R) per stratum
+    reservoirs = defaultdict(list)
+    seen = defaultdict(int)
+    retrieved = 0
     
-    for start, end in page_ranges:
-        range_chunks = [c for c in chunks if start <= c["page_number"] <= end]
+    for chunk in iter_chunks(qdrant):
+        retrieved += 1
+        page_range = next(
+            ((start, end) for start, end in page_ranges if start <= chunk["page_number"] <= end),
+            None,
+        )
+        if page_range is None:
+            continue
+        
         # Prioritize chunks with article references
-        with_article = [c for c in range_chunks if c.get("article_ref")]
-        without_article = [c for c in range_chunks if not c.get("article_ref")]
+        has_article = bool(chunk.get("article_ref"))
+        key = (page_range, has_article)
+        n = seen[key]
+        seen[key] += 1
         
-        # Take 70% from chunks with articles, 30% without
-        n_with = min(int(per_range * 0.7), len(with_article))
-        n_without = min(per_range - n_with, len(without_article))
+        if n < capacity[has_article]:
+            reservoirs[key].append(chunk)
+        else:
+            j = random.randrange(n + 1)
+            if j < capacity[has_article]:
+                reservoirs[key][j] = chunk
+    
+    print(f"✓ Retrieved {retrieved} chunks")
+    
+    sampled = []
+    for page_range in page_ranges:
+        with_article = reservoirs[(page_range, True)]
+        without_article = reservoirs[(page_range, False)]
         
-        sampled.extend(random.sample(with_article, n_with) if n_with > 0 else [])
+        n_without = min(per_range - len(with_article), len(without_article))
+        
+        sampled.extend(with_article)
         sampled.extend(random.sample(without_article, n_without) if n_without > 0 else [])
     
     random.shuffle(sampled)
@@ -168,10 +207,11 @@ Format JSON requis:
 Si impossible de générer une bonne question, retourne: {"skip": true, "reason": "..."}"""
 
 
-def generate_qa_for_chunk(
+async def generate_qa_for_chunk(
     chunk: dict,
     target_type: str,
-    existing_questions: set[str]
+    existing_questions: set[str],
+    recent_questions: deque[str]
 ) -> dict | None:
     """
     Generate a Q&A pair for a single chunk using GPT-4o.
@@ -180,6 +220,7 @@ def generate_qa_for_chunk(
         chunk: The regulation chunk with content and metadata
         target_type: The type of query to generate
         existing_questions: Set of already generated questions to avoid duplicates
+        recent_questions: Last few generated questions, shown to the model
     
     Returns:
         Generated Q&A dict or None if generation failed/skipped
@@ -208,12 +249,12 @@ Instructions spécifiques:
 {type_instructions.get(target_type, type_instructions['single_lookup'])}
 
 Questions déjà générées (ÉVITER les doublons):
-{list(existing_questions)[-5:]}
+{list(recent_questions)}
 
 Génère UNE paire Question-Réponse de type '{target_type}' en JSON."""
 
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model=GENERATION_MODEL,
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -253,6 +294,80 @@ Génère UNE paire Question-Réponse de type '{target_type}' en JSON."""
 # =============================================================================
 # BATCH GENERATION WITH QUALITY CHECKS
 # =============================================================================
+async def generate_pairs(
+    chunks: list[dict],
+    type_targets: dict[str, int],
+    target_count: int
+) -> tuple[list[dict], dict[str, int]]:
+    """
+    Generate Q&A pairs with a pool of GENERATION_CONCURRENCY worker tasks.
+    
+    A producer task feeds the chunks through a bounded queue and each worker
+    starts its next request as soon as the previous one returns, so a slow
+    completion no longer holds back a whole wave. A query type is reserved
+    when a request starts and released if the pair is rejected, so requests
+    in flight never plan more pairs of a type than are still missing.
+    """
+    generated = []
+    existing_questions = set()  # Membership checks only
+    recent_questions = deque(maxlen=5)  # Shown in the prompt
+    type_counts = {qtype: 0 for qtype in type_targets}
+    planned = dict(type_counts)  # Accepted + in flight, per type
+    queue = asyncio.Queue(maxsize=GENERATION_CONCURRENCY * 2)
+    state_changed = asyncio.Condition()
+    
+    def needed_types() -> list[str]:
+        return [qtype for qtype, count in planned.items() if count < type_targets[qtype]]
+    
+    def can_plan() -> bool:
+        return sum(planned.values()) < target_count and bool(needed_types())
+    
+    def nothing_in_flight() -> bool:
+        return sum(planned.values()) == len(generated)
+    
+    async def producer():
+        for chunk in chunks:
+            await queue.put(chunk)
+        for _ in range(GENERATION_CONCURRENCY):
+            await queue.put(None)  # One stop signal per worker
+    
+    async def worker(pbar):
+        while True:
+            chunk = await queue.get()
+            if chunk is None:
+                return
+            
+            async with state_changed:
+                # Wait for a type to free up unless no request can release one
+                await state_changed.wait_for(lambda: can_plan() or nothing_in_flight())
+                if not can_plan():
+                    return
+                target_type = random.choice(needed_types())
+                planned[target_type] += 1
+            
+            qa = await generate_qa_for_chunk(chunk, target_type, existing_questions, recent_questions)
+            
+            async with state_changed:
+                # Concurrent requests can't see each other's questions
+                if qa and qa["question"] not in existing_questions:
+                    qa["query_type"] = target_type  # Ensure type is set
+                    generated.append(qa)
+                    existing_questions.add(qa["question"])
+                    recent_questions.append(qa["question"])
+                    type_counts[target_type] += 1
+                    pbar.update(1)
+                else:
+                    planned[target_type] -= 1
+                state_changed.notify_all()
+    
+    with tqdm(total=target_count, desc="Generating") as pbar:
+        feeder = asyncio.create_task(producer())
+        await asyncio.gather(*(worker(pbar) for _ in range(GENERATION_CONCURRENCY)))
+        feeder.cancel()  # Workers may stop early, leaving the producer blocked on put
+    
+    return generated, type_counts
+
+
 def generate_evaluation_dataset(
     target_count: int = 80,
     dry_run: bool = False
@@ -281,42 +396,11 @@ def generate_evaluation_dataset(
             print(f"  {chunk['content'][:200]}...")
         return []
     
-    # Generate Q&A pairs
-    generated = []
-    existing_questions = set()
-    type_counts = {qtype: 0 for qtype in TARGET_DISTRIBUTION}
-    
     print(f"\n🤖 Generating Q&A pairs using {GENERATION_MODEL}...")
     
     # Shuffle chunks and iterate
     random.shuffle(chunks)
-    chunk_index = 0
-    
-    with tqdm(total=target_count, desc="Generating") as pbar:
-        while len(generated) < target_count and chunk_index < len(chunks):
-            chunk = chunks[chunk_index]
-            chunk_index += 1
-            
-            # Determine which type to generate (pick underrepresented)
-            needed_types = [
-                qtype for qtype, count in type_counts.items()
-                if count < type_targets[qtype]
-            ]
-            
-            if not needed_types:
-                break
-            
-            target_type = random.choice(needed_types)
-            
-            # Generate
-            qa = generate_qa_for_chunk(chunk, target_type, existing_questions)
-            
-            if qa:
-                qa["query_type"] = target_type  # Ensure type is set
-                generated.append(qa)
-                existing_questions.add(qa["question"])
-                type_counts[target_type] = type_counts.get(target_type, 0) + 1
-                pbar.update(1)
+    generated, type_counts = asyncio.run(generate_pairs(chunks, type_targets, target_count))
     
     # Summary
     print(f"\n✓ Generated {len(generated)} Q&A pairs")
@@ -329,6 +413,10 @@ def generate_evaluation_dataset(
     return generated
 
 
+# Short questions opening with these are rejected as too generic
+GENERIC_QUESTION_STARTS = ("what is", "qu'est-ce que", "define", "explain")
+
+
 def validate_dataset(dataset: list[dict]) -> list[dict]:
     """
     Post-generation validation and cleanup with STRICT quality checks.
@@ -368,8 +456,7 @@ def validate_dataset(dataset: list[dict]) -> list[dict]:
             continue
         
         # STRICT: Question should not be too generic
-        generic_starts = ["what is", "qu'est-ce que", "define", "explain"]
-        is_too_generic = any(question.lower().startswith(g) for g in generic_starts) and len(question) < 50
+        is_too_generic = len(question) < 50 and question.lower().startswith(GENERIC_QUESTION_STARTS)
         if is_too_generic:
             rejected_reasons["too_generic"] = rejected_reasons.get("too_generic", 0) + 1
             continue
@@ -9,12 +9,16 @@ from .retrieval import (
     mean_reciprocal_rank,
     ndcg_at_k,
     negative_precision,
+    metrics_at_k,
     RetrievalEvaluator
 )
 
 from .llm_judge import (
     judge_relevance,
     judge_faithfulness,
+    ajudge_relevance,
+    ajudge_faithfulness,
+    cached_judge_call,
     LLMJudgeEvaluator
 )
 
@@ -26,9 +30,13 @@ __all__ = [
     "mean_reciprocal_rank",
     "ndcg_at_k",
     "negative_precision",
+    "metrics_at_k",
     "RetrievalEvaluator",
     # LLM Judge
     "judge_relevance",
     "judge_faithfulness",
+    "ajudge_relevance",
+    "ajudge_faithfulness",
+    "cached_judge_call",
     "LLMJudgeEvaluator"
 ]
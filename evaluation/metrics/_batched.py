@@ -0,0 +1,342 @@
+"""
+Batched Retrieval Scoring
+
+NumPy (and optionally Numba) kernels behind RetrievalEvaluator. Kept out of
+retrieval.py so the per-query metric functions import without NumPy; the
+evaluator loads this module the first time it scores a batch.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
+from .retrieval import MAX_K, _DISCOUNT, _IDEAL_DCG, _ResultColumns, _add_totals
+
+# Same tables as the scalar metrics, so both paths give identical scores
+_DISCOUNT_ARRAY = np.array(_DISCOUNT)
+_IDEAL_DCG_ARRAY = np.array(_IDEAL_DCG)
+
+
+def _discounts(n: int) -> np.ndarray:
+    """Discounts for ranks 1..n (computed on demand beyond MAX_K)."""
+    if n <= MAX_K:
+        return _DISCOUNT_ARRAY[:n]
+    return 1.0 / np.log2(np.arange(2, n + 2))
+
+
+def _ideal_dcg_table(n: int) -> np.ndarray:
+    """Ideal DCG for 0..n relevant docs."""
+    if n <= MAX_K:
+        return _IDEAL_DCG_ARRAY[:n + 1]
+    return np.concatenate(([0.0], np.cumsum(_discounts(n))))
+
+
+def _take_rows(
+    flat: np.ndarray,
+    offsets: np.ndarray,
+    rows: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Gather rows of a CSR array (row i owns flat[offsets[i]:offsets[i + 1]])."""
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    row_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=row_offsets[1:])
+    positions = np.repeat(starts - row_offsets[:-1], lengths) + np.arange(row_offsets[-1])
+    return flat[positions], row_offsets
+
+
+def _pad_rows(
+    flat: np.ndarray,
+    offsets: np.ndarray,
+    min_width: int = 0,
+    max_width: int | None = None
+) -> np.ndarray:
+    """Lay CSR rows out as a matrix padded with -1, keeping at most max_width columns."""
+    lengths = np.diff(offsets)
+    width = int(lengths.max(initial=0))
+    if max_width is not None:
+        width = min(width, max_width)
+    width = max(min_width, width)
+    
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    columns = np.arange(len(flat)) - np.repeat(offsets[:-1], lengths)
+    keep = columns < width
+    matrix = np.full((len(lengths), width), -1, dtype=np.int64)
+    matrix[rows[keep], columns[keep]] = flat[keep]
+    return matrix
+
+
+def _encode(
+    store: _ResultColumns,
+    rows: np.ndarray,
+    min_width: int = 0,
+    max_width: int | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Encoded arrays for the given rows of a result store.
+    
+    Args:
+        store: Column-wise results
+        rows: Row indices to take
+        min_width: Pad rows to at least this many ranks
+        max_width: Only keep the top max_width retrieved IDs
+    
+    Returns:
+        retrieved: (queries x ranks) int64 matrix, padded with -1
+        expected_flat, expected_offsets: Distinct expected IDs per query,
+            sorted, in CSR layout
+    """
+    retrieved = _take_rows(
+        np.array(store.retrieved, dtype=np.int64),
+        np.array(store.retrieved_offsets, dtype=np.int64),
+        rows
+    )
+    expected_flat, expected_offsets = _take_rows(
+        np.array(store.expected, dtype=np.int64),
+        np.array(store.expected_offsets, dtype=np.int64),
+        rows
+    )
+    return _pad_rows(*retrieved, min_width, max_width), expected_flat, expected_offsets
+
+
+def _relevance_matrix(
+    retrieved: np.ndarray,
+    expected_flat: np.ndarray,
+    expected_offsets: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Boolean hit matrix for encoded results (see _encode).
+    
+    Membership is a single np.isin over (query, id) keys instead of a Python
+    set lookup per rank.
+    
+    Returns:
+        hits: hits[i, r] is True if rank r + 1 of query i is an expected ID
+        first_hits: hits that are the first occurrence of that ID in the row
+        n_expected: Number of distinct expected IDs per query
+    """
+    n_queries = retrieved.shape[0]
+    n_expected = np.diff(expected_offsets)
+    n_ids = int(max(retrieved.max(initial=-1), expected_flat.max(initial=-1))) + 1
+    valid = retrieved >= 0
+    
+    # (query, id) keys are unique across the batch
+    retrieved_keys = np.arange(n_queries, dtype=np.int64)[:, None] * n_ids + retrieved
+    expected_keys = np.repeat(np.arange(n_queries, dtype=np.int64), n_expected) * n_ids + expected_flat
+    hits = valid & np.isin(retrieved_keys, expected_keys)
+    
+    # Keys are row-major, so np.unique's first index is the first occurrence
+    first = np.zeros(retrieved.size, dtype=bool)
+    valid_positions = np.flatnonzero(valid.ravel())
+    _, first_index = np.unique(retrieved_keys.ravel()[valid_positions], return_index=True)
+    first[valid_positions[first_index]] = True
+    first_hits = hits & first.reshape(retrieved.shape)
+    
+    return hits, first_hits, n_expected
+
+
+def _running_sums(values: np.ndarray, k_values: np.ndarray) -> np.ndarray:
+    """Row sums over the top k columns of values, for each k in k_values."""
+    sums = np.zeros((values.shape[0], values.shape[1] + 1))
+    np.cumsum(values, axis=1, out=sums[:, 1:])
+    return sums[:, k_values]
+
+
+def _metrics_numpy(
+    retrieved: np.ndarray,
+    expected_flat: np.ndarray,
+    expected_offsets: np.ndarray,
+    k_values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-query recall, precision and NDCG at each K, and reciprocal rank.
+    
+    Running sums along the rank axis give every K without rescanning;
+    column k of a running sum covers the top k ranks, so K = 0 reads zeros.
+    
+    Returns:
+        (recall, precision, ndcg) as (queries x len(k_values)) arrays,
+        and reciprocal ranks as a (queries,) array
+    """
+    hits, first_hits, n_expected = _relevance_matrix(retrieved, expected_flat, expected_offsets)
+    no_expected = (n_expected == 0)[:, None]  # No expected docs = perfect recall
+    
+    hit_counts = _running_sums(hits, k_values)
+    distinct_hit_counts = _running_sums(first_hits, k_values)
+    dcg = _running_sums(hits * _discounts(hits.shape[1]), k_values)
+    ideal = _ideal_dcg_table(hits.shape[1])[np.minimum(n_expected[:, None], k_values)]
+    
+    recall = np.where(no_expected, 1.0, distinct_hit_counts / np.maximum(n_expected, 1)[:, None])
+    precision = np.where(k_values > 0, hit_counts / np.maximum(k_values, 1), 0.0)
+    # Zero ideal DCG (no expected docs, or K = 0) scores 1.0, as in ndcg_at_k
+    no_ideal = ideal == 0
+    ndcg = np.where(no_ideal, 1.0, dcg / np.where(no_ideal, 1.0, ideal))
+    
+    # 1 / rank of the first hit over the full result list
+    reciprocal_ranks = np.where(hits.any(axis=1), 1.0 / (hits.argmax(axis=1) + 1), 0.0)
+    
+    return recall, precision, ndcg, reciprocal_ranks
+
+
+def _metrics_kernel(
+    retrieved: np.ndarray,
+    expected_flat: np.ndarray,
+    expected_offsets: np.ndarray,
+    discounts: np.ndarray,
+    ideal_dcg: np.ndarray,
+    k_values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Same result as _metrics_numpy, fused into one pass per query.
+    
+    Compiled with Numba when it is installed (queries run in parallel);
+    k_values must be sorted ascending and at most the matrix width.
+    """
+    n_queries, width = retrieved.shape
+    n_k = k_values.shape[0]
+    recall = np.empty((n_queries, n_k))
+    precision = np.empty((n_queries, n_k))
+    ndcg = np.empty((n_queries, n_k))
+    reciprocal_ranks = np.zeros(n_queries)
+    
+    for row in prange(n_queries):
+        expected = expected_flat[expected_offsets[row]:expected_offsets[row + 1]]
+        n_expected = expected.shape[0]
+        hits = 0
+        distinct_hits = 0
+        dcg = 0.0
+        next_k = 0
+        
+        # K = 0 covers no ranks
+        while next_k < n_k and k_values[next_k] == 0:
+            precision[row, next_k] = 0.0
+            recall[row, next_k] = 1.0 if n_expected == 0 else 0.0
+            ndcg[row, next_k] = 1.0
+            next_k += 1
+        
+        for rank in range(width):
+            doc_id = retrieved[row, rank]
+            if doc_id >= 0 and n_expected > 0:
+                # expected is sorted: binary search
+                pos = np.searchsorted(expected, doc_id)
+                if pos < n_expected and expected[pos] == doc_id:
+                    hits += 1
+                    dcg += discounts[rank]
+                    if reciprocal_ranks[row] == 0.0:
+                        reciprocal_ranks[row] = 1.0 / (rank + 1)
+                    # Recall counts each expected ID once
+                    repeated = False
+                    for earlier in range(rank):
+                        if retrieved[row, earlier] == doc_id:
+                            repeated = True
+                            break
+                    if not repeated:
+                        distinct_hits += 1
+            
+            while next_k < n_k and k_values[next_k] == rank + 1:
+                k = k_values[next_k]
+                precision[row, next_k] = hits / k
+                if n_expected == 0:
+                    recall[row, next_k] = 1.0
+                    ndcg[row, next_k] = 1.0
+                else:
+                    recall[row, next_k] = distinct_hits / n_expected
+                    ndcg[row, next_k] = dcg / ideal_dcg[min(n_expected, k)]
+                next_k += 1
+    
+    return recall, precision, ndcg, reciprocal_ranks
+
+
+if NUMBA_AVAILABLE:
+    _metrics_kernel = njit(parallel=True, cache=True)(_metrics_kernel)
+
+
+def _positive_columns(
+    encoded: tuple[np.ndarray, np.ndarray, np.ndarray],
+    k_values: list[int]
+) -> dict[str, np.ndarray]:
+    """
+    Per-query metrics for encoded positive results, keyed like compute_metrics.
+    
+    All queries are scored in one batch, by the Numba kernel when available
+    and NumPy otherwise.
+    """
+    ks = np.array(sorted(set(k_values)), dtype=np.int64)
+    
+    if NUMBA_AVAILABLE:
+        width = encoded[0].shape[1]
+        recall, precision, ndcg, reciprocal_ranks = _metrics_kernel(
+            *encoded, _discounts(width), _ideal_dcg_table(width), ks
+        )
+    else:
+        recall, precision, ndcg, reciprocal_ranks = _metrics_numpy(*encoded, ks)
+    
+    columns = {}
+    for k in k_values:
+        column = np.searchsorted(ks, k)
+        columns[f"recall@{k}"] = recall[:, column]
+        columns[f"precision@{k}"] = precision[:, column]
+        columns[f"ndcg@{k}"] = ndcg[:, column]
+    columns["mrr"] = reciprocal_ranks
+    
+    return columns
+
+
+def _negative_columns(encoded: tuple[np.ndarray, np.ndarray, np.ndarray]) -> dict[str, np.ndarray]:
+    """Per-query negative precision: share of the top 10 that excludes the negatives."""
+    _, first_hits, _ = _relevance_matrix(*encoded)
+    return {"negative_exclusion_rate": 1.0 - first_hits.sum(axis=1) / 10}
+
+
+def add_batch(
+    totals: dict,
+    group_totals: dict[str, dict],
+    store: _ResultColumns,
+    rows: range,
+    k_values: list[int]
+):
+    """
+    Score stored rows and add them to running totals.
+    
+    group_totals maps a metadata key to {group value: totals}; per-group sums
+    come from one np.bincount over the batch's per-query metrics.
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    is_negative = np.array(store.is_negative, dtype=bool)[rows]
+    
+    for negative in (False, True):
+        batch = rows[is_negative == negative]
+        if not batch.size:
+            continue
+        
+        if negative:
+            columns = _negative_columns(_encode(store, batch, min_width=10, max_width=10))
+            count_key = "total_negative_cases"
+        else:
+            columns = _positive_columns(_encode(store, batch, min_width=max(k_values)), k_values)
+            count_key = "total_positive_cases"
+        
+        _add_totals(totals, count_key, len(batch), {
+            name: float(values.sum()) for name, values in columns.items()
+        })
+        
+        for group_key, groups in group_totals.items():
+            codes = {}
+            labels = np.array([
+                codes.setdefault(store.metadata[row].get(group_key, "unknown"), len(codes))
+                for row in batch
+            ], dtype=np.int64)
+            counts = np.bincount(labels, minlength=len(codes))
+            sums = {
+                name: np.bincount(labels, weights=values, minlength=len(codes))
+                for name, values in columns.items()
+            }
+            for code, group in enumerate(codes):
+                _add_totals(groups.setdefault(group, {}), count_key, int(counts[code]), {
+                    name: float(values[code]) for name, values in sums.items()
+                })
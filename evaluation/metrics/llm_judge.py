@@ -11,35 +11,252 @@ Metrics:
 - Binary Relevance: % of results above threshold
 """
 
+import asyncio
+import hashlib
 import os
 import json
-from typing import Literal
+import sqlite3
+import statistics
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Literal
 
 import ollama
+import orjson
 from dotenv import load_dotenv
+from pydantic import BaseModel, ConfigDict, Field
 
 load_dotenv()
 
-# Use Qwen2.5:7b via Ollama (fully local, no API costs)
-JUDGE_MODEL = "qwen2.5:7b-instruct-q4_K_M"
+# Use Qwen2.5:7b via Ollama (fully local, no API costs).
+# A smaller judge (e.g. qwen2.5:1.5b-instruct-q4_K_M) is much faster for
+# scoring-only runs, but its scores are not comparable with the default's.
+JUDGE_MODEL = os.getenv("FAIRTRACE_JUDGE_MODEL", "qwen2.5:7b-instruct-q4_K_M")
 JUDGE_TEMPERATURE = 0.0  # Deterministic judgments
+JUDGE_KEEP_ALIVE = "30m"  # Keep the judge loaded between evaluation phases
 
+# Optional relevance panel, e.g. FAIRTRACE_JUDGE_MODELS="qwen2.5:7b-instruct-q4_K_M,
+# llama3.1:8b-instruct-q4_K_M,mistral:7b-instruct-q4_K_M": every model judges
+# concurrently and the votes are combined, reducing single-model bias.
+JUDGE_MODELS = [
+    model.strip() for model in os.getenv("FAIRTRACE_JUDGE_MODELS", "").split(",") if model.strip()
+] or [JUDGE_MODEL]
 
-def get_judge_llm_response(system_prompt: str, user_message: str) -> str:
-    """Call the local Qwen LLM judge via Ollama."""
-    response = ollama.chat(
-        model=JUDGE_MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_message}
-        ],
-        options={"temperature": JUDGE_TEMPERATURE},
-        format="json"  # Force JSON output
+# Scores-only relevance judging: no per-document reasons, so the judge
+# generates a few tokens per document instead of a sentence
+JUDGE_SCORES_ONLY = os.getenv("FAIRTRACE_JUDGE_SCORES_ONLY", "0") == "1"
+SCORES_ONLY_NUM_PREDICT = 128  # Ample for the compact schema; caps runaway output
+
+# Judge requests in flight at once; match the server's OLLAMA_NUM_PARALLEL
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+JUDGE_TIMEOUT = float(os.getenv("FAIRTRACE_JUDGE_TIMEOUT", "120"))  # Seconds per request
+
+# One pooled connection for all sync judge calls
+_judge_client = ollama.Client(host=OLLAMA_HOST, timeout=JUDGE_TIMEOUT)
+
+# Persistent response cache: reruns re-judge identical prompts, and with a
+# deterministic judge the stored response is the one the model would give.
+# Set FAIRTRACE_JUDGE_CACHE=0 to always call the model.
+JUDGE_CACHE_ENABLED = os.getenv("FAIRTRACE_JUDGE_CACHE", "1") != "0"
+JUDGE_CACHE_PATH = Path(__file__).parent / ".judge_cache.sqlite"
+
+_judge_cache_db: sqlite3.Connection | None = None
+_judge_cache_lock = threading.Lock()  # Judged from worker threads too
+_judge_cache_hits = 0
+_judge_cache_misses = 0
+
+
+def _get_judge_cache_db() -> sqlite3.Connection:
+    """Get or create the judge cache connection."""
+    global _judge_cache_db
+    if _judge_cache_db is None:
+        _judge_cache_db = sqlite3.connect(JUDGE_CACHE_PATH, check_same_thread=False)
+        _judge_cache_db.execute(
+            "CREATE TABLE IF NOT EXISTS judgments (key TEXT PRIMARY KEY, response TEXT NOT NULL)"
+        )
+    return _judge_cache_db
+
+
+def _judge_cache_key(model: str, system_prompt: str, user_message: str) -> str:
+    """Content hash of everything that determines the judge's response."""
+    # NUL separators keep ("ab", "c") and ("a", "bc") apart
+    key_data = "\0".join((model, system_prompt, user_message))
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+def _get_cached_judge_response(key: str) -> str | None:
+    global _judge_cache_hits, _judge_cache_misses
+    if not JUDGE_CACHE_ENABLED:
+        return None
+    
+    with _judge_cache_lock:
+        row = _get_judge_cache_db().execute(
+            "SELECT response FROM judgments WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            _judge_cache_misses += 1
+            return None
+        
+        _judge_cache_hits += 1
+    return row[0]
+
+
+def _cache_judge_response(key: str, response: str):
+    if not JUDGE_CACHE_ENABLED:
+        return
+    
+    with _judge_cache_lock:
+        db = _get_judge_cache_db()
+        db.execute("INSERT OR REPLACE INTO judgments (key, response) VALUES (?, ?)", (key, response))
+        db.commit()
+
+
+def cached_judge_call(
+    model: str,
+    system_prompt: str,
+    user_message: str,
+    fn: Callable[[], str],
+    parse: Callable[[str], Any] | None = None
+) -> Any:
+    """
+    Judge response for a prompt from the response cache, calling fn() on a miss.
+    
+    For judges outside this module that share the cache. The key covers the
+    model and both prompts; fn must return the raw response text.
+    
+    Args:
+        model: Judge model name
+        system_prompt: System prompt sent to the judge
+        user_message: User message sent to the judge
+        fn: Calls the judge and returns its response text
+        parse: Applied to the response (cached or fresh) before returning.
+            A fresh response is only cached if parse succeeds, so malformed
+            output is retried next run; parse errors propagate.
+    
+    Returns:
+        parse(response), or the response text if parse is None
+    """
+    key = _judge_cache_key(model, system_prompt, user_message)
+    cached = _get_cached_judge_response(key)
+    if cached is not None:
+        return parse(cached) if parse else cached
+    
+    response = fn()
+    result = parse(response) if parse else response
+    _cache_judge_response(key, response)
+    return result
+
+
+def get_judge_cache_stats() -> dict:
+    """Judge cache hits and misses for this process, plus stored entries."""
+    entries = 0
+    with _judge_cache_lock:
+        hits, misses = _judge_cache_hits, _judge_cache_misses
+        if JUDGE_CACHE_ENABLED:
+            entries = _get_judge_cache_db().execute("SELECT COUNT(*) FROM judgments").fetchone()[0]
+    
+    lookups = hits + misses
+    return {
+        "enabled": JUDGE_CACHE_ENABLED,
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / lookups if lookups else 0.0,
+        "entries": entries,
+    }
+
+
+def _judge_options(num_predict: int | None) -> dict:
+    options = {"temperature": JUDGE_TEMPERATURE}
+    if num_predict is not None:
+        options["num_predict"] = num_predict
+    return options
+
+
+def get_judge_llm_response(
+    system_prompt: str,
+    user_message: str,
+    num_predict: int | None = None,
+    model: str | None = None,
+    parse: Callable[[str], Any] | None = None
+) -> Any:
+    """
+    Call the local Qwen LLM judge via Ollama (cached by prompt hash).
+    
+    The static instructions go in the system prompt and everything
+    per-call in user_message, so the prompt always starts with the same
+    tokens and Ollama can reuse their KV cache instead of re-reading them.
+    
+    As in cached_judge_call, a fresh response is only cached once parse
+    accepts it, so malformed or truncated JSON is not replayed next run.
+    """
+    model = model or JUDGE_MODEL
+    
+    def generate() -> str:
+        response = _judge_client.generate(
+            model=model,
+            system=system_prompt,
+            prompt=user_message,
+            options=_judge_options(num_predict),
+            format="json",  # Force JSON output
+            keep_alive=JUDGE_KEEP_ALIVE
+        )
+        return response["response"]
+    
+    return cached_judge_call(model, system_prompt, user_message, generate, parse=parse)
+
+
+async def aget_judge_llm_response(
+    client: ollama.AsyncClient,
+    system_prompt: str,
+    user_message: str,
+    num_predict: int | None = None,
+    model: str | None = None,
+    parse: Callable[[str], Any] | None = None
+) -> Any:
+    """Async variant of get_judge_llm_response, sharing the caller's client."""
+    model = model or JUDGE_MODEL
+    key = _judge_cache_key(model, system_prompt, user_message)
+    cached = _get_cached_judge_response(key)
+    if cached is not None:
+        return parse(cached) if parse else cached
+    
+    response = await client.generate(
+        model=model,
+        system=system_prompt,
+        prompt=user_message,
+        options=_judge_options(num_predict),
+        format="json",  # Force JSON output
+        keep_alive=JUDGE_KEEP_ALIVE
     )
-    return response["message"]["content"]
+    content = response["response"]
+    result = parse(content) if parse else content
+    _cache_judge_response(key, content)
+    return result
+
 
+def _async_judge_client() -> ollama.AsyncClient:
+    """Async client configured like _judge_client (create one per event loop)."""
+    return ollama.AsyncClient(host=OLLAMA_HOST, timeout=JUDGE_TIMEOUT)
 
-RELEVANCE_PROMPT = """You are an expert evaluator for a credit decision retrieval system.
+
+def _preload_judge_model():
+    """Load the judge into memory so the first judgment skips the cold start."""
+    try:
+        # An empty prompt only loads the model
+        _judge_client.generate(model=JUDGE_MODEL, prompt="", keep_alive=JUDGE_KEEP_ALIVE)
+    except Exception as e:
+        print(f"⚠️ Judge preload failed: {e}")
+
+
+# Opt-in: start loading the judge in the background at import time
+if os.getenv("FAIRTRACE_JUDGE_PRELOAD", "0") == "1":
+    threading.Thread(target=_preload_judge_model, daemon=True).start()
+
+
+_RELEVANCE_INSTRUCTIONS = """You are an expert evaluator for a credit decision retrieval system.
 
 Your task is to judge whether retrieved documents are RELEVANT to the query.
 
@@ -53,7 +270,9 @@ Score each document from 0 to 1:
 - 0.7-0.9 = Relevant, useful for the query
 - 0.4-0.6 = Partially relevant, some useful info
 - 0.1-0.3 = Marginally relevant
-- 0.0 = Not relevant at all
+- 0.0 = Not relevant at all"""
+
+RELEVANCE_PROMPT = _RELEVANCE_INSTRUCTIONS + """
 
 Output JSON:
 {
@@ -64,6 +283,12 @@ Output JSON:
     "overall_relevance": 0.55
 }"""
 
+# Scores are listed in document order, without reasons
+RELEVANCE_PROMPT_SCORES_ONLY = _RELEVANCE_INSTRUCTIONS + """
+
+Output JSON, one score per document in order:
+{"scores": [0.8, 0.3], "overall_relevance": 0.55}"""
+
 
 def format_document_for_judge(doc: dict, index: int) -> str:
     """Format a retrieved document for the LLM judge."""
@@ -108,135 +333,479 @@ def format_document_for_judge(doc: dict, index: int) -> str:
 {key_info}"""
 
 
+def format_documents_for_judge(docs: list[dict]) -> str:
+    """Format a batch of retrieved documents, numbered from 0."""
+    return "\n\n".join(map(format_document_for_judge, docs, range(len(docs))))
+
+
+def _relevance_result(
+    scores: list | None = None,
+    overall_relevance: float = 0.0,
+    binary_relevance: float = 0.0,
+    error: str | None = None
+) -> dict:
+    return {
+        "scores": scores or [],
+        "overall_relevance": overall_relevance,
+        "binary_relevance": binary_relevance,
+        "error": error
+    }
+
+
+def _relevance_message(query: str, docs_to_judge: list[dict]) -> str:
+    """Build the user message asking the judge to score each document."""
+    docs_text = format_documents_for_judge(docs_to_judge)
+    
+    return f"""Query: "{query}"
+
+Retrieved Documents:
+{docs_text}
+
+Judge the relevance of each document to the query. Output JSON."""
+
+
+class RelevanceScore(BaseModel):
+    """Judge score for one document (extra keys from the model are kept)."""
+    model_config = ConfigDict(extra="allow")
+    
+    doc_index: int | None = Field(None, description="Position of the document in the prompt")
+    score: float = Field(..., description="Relevance from 0 to 1")
+    reason: str | None = Field(None, description="Short justification")
+
+
+class RelevanceVerdict(BaseModel):
+    """Schema of the judge's relevance output."""
+    scores: list[RelevanceScore] = Field(default_factory=list)
+    overall_relevance: float = 0.0
+
+
+class ScoresOnlyRelevanceVerdict(BaseModel):
+    """Schema of the judge's output for RELEVANCE_PROMPT_SCORES_ONLY."""
+    scores: list[float] = Field(default_factory=list)
+    overall_relevance: float = 0.0
+
+
+def _relevance_request(user_message: str, scores_only: bool) -> tuple[str, str, int | None]:
+    """(system prompt, user message, num_predict) for the requested mode."""
+    if scores_only:
+        return RELEVANCE_PROMPT_SCORES_ONLY, user_message, SCORES_ONLY_NUM_PREDICT
+    return RELEVANCE_PROMPT, user_message, None
+
+
+def _parse_relevance(response_text: str, scores_only: bool = False) -> dict:
+    if scores_only:
+        compact = ScoresOnlyRelevanceVerdict.model_validate(orjson.loads(response_text))
+        verdict = RelevanceVerdict(
+            scores=[RelevanceScore(doc_index=i, score=score) for i, score in enumerate(compact.scores)],
+            overall_relevance=compact.overall_relevance
+        )
+    else:
+        verdict = RelevanceVerdict.model_validate(orjson.loads(response_text))
+    
+    # Calculate binary relevance (% above 0.5 threshold)
+    scores = verdict.scores
+    binary_relevance = sum(1 for s in scores if s.score >= 0.5) / len(scores) if scores else 0.0
+    
+    return _relevance_result(
+        scores=[s.model_dump(exclude_unset=True) for s in scores],
+        overall_relevance=verdict.overall_relevance,
+        binary_relevance=binary_relevance
+    )
+
+
+def _aggregate_panel(results: list[dict]) -> dict:
+    """
+    Combine relevance results from several judge models.
+    
+    Documents are matched by position. Each document gets the median score
+    and is relevant if a majority of judges scored it >= 0.5; the overall
+    relevance is the median. Judges that failed are left out.
+    """
+    judged = [r for r in results if not r["error"]]
+    if not judged:
+        return _relevance_result(error="; ".join(r["error"] for r in results))
+    
+    n_docs = max(len(r["scores"]) for r in judged)
+    scores = []
+    relevant_docs = 0
+    
+    for i in range(n_docs):
+        doc_scores = [r["scores"][i]["score"] for r in judged if i < len(r["scores"])]
+        votes = sum(1 for score in doc_scores if score >= 0.5)
+        relevant_docs += votes * 2 > len(doc_scores)
+        scores.append({
+            "doc_index": i,
+            "score": statistics.median(doc_scores),
+            "relevant_votes": votes,
+            "judges": len(doc_scores)
+        })
+    
+    return _relevance_result(
+        scores=scores,
+        overall_relevance=statistics.median(r["overall_relevance"] for r in judged),
+        binary_relevance=relevant_docs / n_docs if n_docs else 0.0
+    )
+
+
 def judge_relevance(
     query: str,
     retrieved_docs: list[dict],
-    max_docs: int = 5
+    max_docs: int = 5,
+    reasons: bool | None = None
 ) -> dict:
     """
     Use LLM to judge relevance of retrieved documents.
     
+    With several JUDGE_MODELS, the panel is judged concurrently (see
+    ajudge_relevance); don't call it from inside a running event loop.
+    
     Args:
         query: The search query
         retrieved_docs: List of retrieved documents from Qdrant
         max_docs: Maximum documents to judge (for cost control)
+        reasons: Ask for a reason per document; False uses the much shorter
+            scores-only output (None = not FAIRTRACE_JUDGE_SCORES_ONLY)
     
     Returns:
         Dict with scores per document and overall relevance
     """
     if not retrieved_docs:
-        return {
-            "scores": [],
-            "overall_relevance": 0.0,
-            "binary_relevance": 0.0,
-            "error": None
-        }
-    
-    # Limit docs for cost
-    docs_to_judge = retrieved_docs[:max_docs]
-    
-    # Format documents
-    docs_text = "\n\n".join(
-        format_document_for_judge(doc, i) 
-        for i, doc in enumerate(docs_to_judge)
-    )
+        return _relevance_result()
     
-    # Build prompt
-    user_message = f"""Query: "{query}"
-
-Retrieved Documents:
-{docs_text}
-
-Judge the relevance of each document to the query. Output JSON."""
+    if len(JUDGE_MODELS) > 1:
+        return asyncio.run(ajudge_relevance(query, retrieved_docs, max_docs, reasons=reasons))
+    
+    scores_only = JUDGE_SCORES_ONLY if reasons is None else not reasons
     
     try:
-        response_text = get_judge_llm_response(RELEVANCE_PROMPT, user_message)
-        result = json.loads(response_text)
-        
-        # Calculate binary relevance (% above 0.5 threshold)
-        scores = [s["score"] for s in result.get("scores", [])]
-        binary_relevance = sum(1 for s in scores if s >= 0.5) / len(scores) if scores else 0.0
+        # Limit docs for cost
+        user_message = _relevance_message(query, retrieved_docs[:max_docs])
+        return get_judge_llm_response(
+            *_relevance_request(user_message, scores_only),
+            parse=lambda text: _parse_relevance(text, scores_only)
+        )
         
-        return {
-            "scores": result.get("scores", []),
-            "overall_relevance": result.get("overall_relevance", 0.0),
-            "binary_relevance": binary_relevance,
-            "error": None
-        }
+    except Exception as e:
+        return _relevance_result(error=str(e))
+
+
+async def _ajudge_relevance_one(
+    client: ollama.AsyncClient,
+    model: str,
+    user_message: str,
+    scores_only: bool
+) -> dict:
+    try:
+        return await aget_judge_llm_response(
+            client, *_relevance_request(user_message, scores_only), model=model,
+            parse=lambda text: _parse_relevance(text, scores_only)
+        )
         
     except Exception as e:
-        return {
-            "scores": [],
-            "overall_relevance": 0.0,
-            "binary_relevance": 0.0,
-            "error": str(e)
-        }
+        return _relevance_result(error=str(e))
 
 
-def judge_faithfulness(
+async def ajudge_relevance(
     query: str,
     retrieved_docs: list[dict],
-    agent_reasoning: str
+    max_docs: int = 5,
+    client: ollama.AsyncClient | None = None,
+    reasons: bool | None = None
 ) -> dict:
     """
-    Judge if agent reasoning is grounded in the retrieved evidence.
+    Async variant of judge_relevance (same prompt and result format).
     
-    Returns faithfulness score 0-1.
+    With several JUDGE_MODELS, all of them judge concurrently and the
+    results are combined by _aggregate_panel, so the wall-clock cost is
+    about that of the slowest model.
+    
+    Pass a shared client when judging many queries so they reuse its
+    connection pool.
     """
-    if not retrieved_docs or not agent_reasoning:
-        return {"faithfulness": 0.0, "error": "Missing docs or reasoning"}
+    if not retrieved_docs:
+        return _relevance_result()
     
-    # Format evidence
-    evidence_text = "\n\n".join(
-        format_document_for_judge(doc, i) 
-        for i, doc in enumerate(retrieved_docs[:5])
-    )
+    try:
+        user_message = _relevance_message(query, retrieved_docs[:max_docs])
+    except Exception as e:
+        return _relevance_result(error=str(e))  # e.g. a malformed payload
+    scores_only = JUDGE_SCORES_ONLY if reasons is None else not reasons
+    client = client or _async_judge_client()
     
-    prompt = f"""You are evaluating whether an AI agent's reasoning is FAITHFUL to the evidence.
+    if len(JUDGE_MODELS) == 1:
+        return await _ajudge_relevance_one(client, JUDGE_MODELS[0], user_message, scores_only)
+    
+    results = await asyncio.gather(*(
+        _ajudge_relevance_one(client, model, user_message, scores_only) for model in JUDGE_MODELS
+    ))
+    return _aggregate_panel(results)
+
+
+FAITHFULNESS_SYSTEM_PROMPT = """You are an expert evaluator for AI reasoning quality.
+
+You are evaluating whether an AI agent's reasoning is FAITHFUL to the evidence.
 
 Faithfulness means:
 1. Claims in the reasoning are supported by the retrieved documents
 2. No hallucinations or made-up facts
 3. Conclusions logically follow from the evidence
 
+Score faithfulness from 0 to 1:
+- 1.0 = Completely faithful, all claims grounded in evidence
+- 0.7-0.9 = Mostly faithful, minor unsupported claims
+- 0.4-0.6 = Partially faithful, some unsupported claims
+- 0.0-0.3 = Unfaithful, major hallucinations
+
+Output JSON:
+{"faithfulness": 0.8, "unsupported_claims": ["..."], "well_grounded_claims": ["..."]}"""
+
+FAITHFULNESS_DELTA_PROMPT = """You previously judged whether an AI agent's reasoning is FAITHFUL to the evidence.
+The agent has since appended new reasoning. Update your verdict given the new text.
+
 Query: "{query}"
 
 Retrieved Evidence:
 {evidence_text}
 
-Agent Reasoning:
-{agent_reasoning}
+Previous Verdict (for the earlier reasoning):
+{prior_verdict}
 
-Score faithfulness from 0 to 1:
-- 1.0 = Completely faithful, all claims grounded in evidence
-- 0.7-0.9 = Mostly faithful, minor unsupported claims
-- 0.4-0.6 = Partially faithful, some unsupported claims
-- 0.0-0.3 = Unfaithful, major hallucinations
+New Reasoning:
+{delta_reasoning}
+
+Keep the previous claims, add the new supported and unsupported ones, and
+re-score faithfulness of the reasoning as a whole from 0 to 1.
 
 Output JSON:
 {{"faithfulness": 0.8, "unsupported_claims": ["..."], "well_grounded_claims": ["..."]}}"""
+
+# Only judge the appended reasoning when this share of it was already judged
+DELTA_MIN_OVERLAP = 0.8
+
+# Last verdict per session_id, for agents whose reasoning grows between calls
+_faithfulness_sessions: dict[str, dict] = {}
+
+
+def _format_evidence(retrieved_docs: list[dict]) -> str:
+    return format_documents_for_judge(retrieved_docs[:5])
+
+
+def _hash_blocks(text: str) -> list[str]:
+    """SHA-256 of each paragraph, in order."""
+    return [hashlib.sha256(block.encode()).hexdigest() for block in text.split("\n\n")]
+
+
+def _faithfulness_prompt(query: str, evidence_text: str, agent_reasoning: str) -> str:
+    """Build the user message asking the judge to score faithfulness."""
+    return f"""Query: "{query}"
+
+Retrieved Evidence:
+{evidence_text}
+
+Agent Reasoning:
+{agent_reasoning}
+
+Judge the faithfulness of the reasoning to the evidence. Output JSON."""
+
+
+def _faithfulness_request(
+    query: str,
+    retrieved_docs: list[dict],
+    agent_reasoning: str,
+    session_id: str | None
+) -> tuple[str | None, dict | None]:
+    """
+    Decide what to send the judge for a faithfulness check.
+    
+    Within a session, if the evidence is unchanged and the reasoning only
+    grew at the tail (at least DELTA_MIN_OVERLAP of its paragraphs already
+    judged), only the new paragraphs are sent along with the previous verdict.
+    The evidence is always included so new claims can be checked against it.
+    
+    Returns:
+        (user message, None), or (None, previous verdict) if nothing changed
+    """
+    evidence_text = _format_evidence(retrieved_docs)
+    session = _faithfulness_sessions.get(session_id) if session_id else None
+    
+    if session and session["evidence"] == hashlib.sha256(evidence_text.encode()).hexdigest():
+        blocks = agent_reasoning.split("\n\n")
+        judged = len(session["blocks"])
+        
+        if _hash_blocks(agent_reasoning)[:judged] == session["blocks"] and judged >= DELTA_MIN_OVERLAP * len(blocks):
+            if judged == len(blocks):
+                return None, dict(session["verdict"])
+            
+            prior_verdict = {key: value for key, value in session["verdict"].items() if key != "error"}
+            return FAITHFULNESS_DELTA_PROMPT.format(
+                query=query,
+                evidence_text=evidence_text,
+                prior_verdict=json.dumps(prior_verdict, ensure_ascii=False, indent=2),
+                delta_reasoning="\n\n".join(blocks[judged:]),
+            ), None
+    
+    return _faithfulness_prompt(query, evidence_text, agent_reasoning), None
+
+
+def _remember_faithfulness(
+    session_id: str | None,
+    retrieved_docs: list[dict],
+    agent_reasoning: str,
+    verdict: dict
+):
+    if session_id is None or verdict.get("error"):
+        return
+    
+    _faithfulness_sessions[session_id] = {
+        "evidence": hashlib.sha256(_format_evidence(retrieved_docs).encode()).hexdigest(),
+        "blocks": _hash_blocks(agent_reasoning),
+        "verdict": verdict,
+    }
+
+
+class FaithfulnessVerdict(BaseModel):
+    """Schema of the judge's faithfulness output."""
+    faithfulness: float = 0.0
+    unsupported_claims: list = Field(default_factory=list)
+    well_grounded_claims: list = Field(default_factory=list)
+
+
+def _parse_faithfulness(response_text: str) -> dict:
+    verdict = FaithfulnessVerdict.model_validate(orjson.loads(response_text))
+    return {**verdict.model_dump(), "error": None}
+
+
+def judge_faithfulness(
+    query: str,
+    retrieved_docs: list[dict],
+    agent_reasoning: str,
+    session_id: str | None = None
+) -> dict:
+    """
+    Judge if agent reasoning is grounded in the retrieved evidence.
+    
+    Pass the same session_id while an agent's reasoning grows to have
+    appended text judged incrementally against the previous verdict.
+    
+    Returns faithfulness score 0-1.
+    """
+    if not retrieved_docs or not agent_reasoning:
+        return {"faithfulness": 0.0, "error": "Missing docs or reasoning"}
+    
+    prompt, previous = _faithfulness_request(query, retrieved_docs, agent_reasoning, session_id)
+    if previous is not None:
+        return previous
     
     try:
-        system_prompt = "You are an expert evaluator for AI reasoning quality."
-        response_text = get_judge_llm_response(system_prompt, prompt)
-        result = json.loads(response_text)
-        return {
-            "faithfulness": result.get("faithfulness", 0.0),
-            "unsupported_claims": result.get("unsupported_claims", []),
-            "well_grounded_claims": result.get("well_grounded_claims", []),
-            "error": None
-        }
+        result = get_judge_llm_response(FAITHFULNESS_SYSTEM_PROMPT, prompt, parse=_parse_faithfulness)
         
     except Exception as e:
         return {"faithfulness": 0.0, "error": str(e)}
+    
+    _remember_faithfulness(session_id, retrieved_docs, agent_reasoning, result)
+    return result
+
+
+async def ajudge_faithfulness(
+    query: str,
+    retrieved_docs: list[dict],
+    agent_reasoning: str,
+    client: ollama.AsyncClient | None = None,
+    session_id: str | None = None
+) -> dict:
+    """Async variant of judge_faithfulness (same prompt and result format)."""
+    if not retrieved_docs or not agent_reasoning:
+        return {"faithfulness": 0.0, "error": "Missing docs or reasoning"}
+    
+    prompt, previous = _faithfulness_request(query, retrieved_docs, agent_reasoning, session_id)
+    if previous is not None:
+        return previous
+    
+    try:
+        result = await aget_judge_llm_response(
+            client or _async_judge_client(), FAITHFULNESS_SYSTEM_PROMPT, prompt,
+            parse=_parse_faithfulness
+        )
+        
+    except Exception as e:
+        return {"faithfulness": 0.0, "error": str(e)}
+    
+    _remember_faithfulness(session_id, retrieved_docs, agent_reasoning, result)
+    return result
+
+
+async def _ajudge_cases(
+    cases: list[dict],
+    max_docs: int,
+    reasons: bool | None = None
+) -> tuple[list[dict], list[tuple[dict, dict]]]:
+    """
+    Judge all cases concurrently, at most OLLAMA_NUM_PARALLEL at a time.
+    
+    The client is created inside the running loop: its pooled connections
+    are bound to that loop and can't be reused by a later asyncio.run().
+    """
+    client = _async_judge_client()
+    semaphore = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+    
+    async def bounded(judgment):
+        async with semaphore:
+            return await judgment
+    
+    reasoned = [case for case in cases if case.get("agent_reasoning")]
+    
+    relevance, faithfulness = await asyncio.gather(
+        asyncio.gather(*(
+            bounded(ajudge_relevance(
+                case["query"], case["retrieved_docs"], max_docs, client=client, reasons=reasons
+            ))
+            for case in cases
+        )),
+        asyncio.gather(*(
+            bounded(ajudge_faithfulness(
+                case["query"], case["retrieved_docs"], case["agent_reasoning"], client=client
+            ))
+            for case in reasoned
+        )),
+    )
+    
+    return relevance, list(zip(reasoned, faithfulness))
 
 
 class LLMJudgeEvaluator:
-    """Aggregates LLM judge scores across multiple test cases."""
+    """
+    Aggregates LLM judge scores across multiple test cases.
+    
+    Scores are summed as results arrive, so compute_metrics is O(1); pass
+    store_results=False to drop the raw results on long runs.
+    
+    Stored per-document relevance scores are packed one byte each
+    (quantized to steps of 1/255) and read back with doc_scores; pass
+    store_reasons=False to also drop the per-document dicts and reasons
+    from relevance_results on large sweeps.
+    """
     
-    def __init__(self):
+    def __init__(self, store_results: bool = True, store_reasons: bool = True):
         self.relevance_results = []
         self.faithfulness_results = []
+        self.store_results = store_results
+        self.store_reasons = store_reasons
+        # Row i owns _doc_scores[_doc_score_offsets[i]:_doc_score_offsets[i + 1]]
+        self._doc_scores = array("B")
+        self._doc_score_offsets = array("q", [0])
+        self._acc = {"overall_relevance": 0.0, "binary_relevance": 0.0, "faithfulness": 0.0}
+        self._count = {"relevance_cases": 0, "faithfulness_cases": 0, **dict.fromkeys(self._acc, 0)}
+    
+    def _accumulate(self, cases_key: str, result: dict, fields: tuple[str, ...]):
+        """Update running sums, skipping scores the judge didn't return."""
+        self._count[cases_key] += 1
+        for field in fields:
+            if result.get(field) is not None:
+                self._acc[field] += result[field]
+                self._count[field] += 1
+    
+    def _mean(self, field: str) -> float:
+        return self._acc[field] / self._count[field] if self._count[field] else 0
     
     def add_relevance_result(
         self,
@@ -245,11 +814,25 @@ class LLMJudgeEvaluator:
         metadata: dict | None = None
     ):
         """Add a relevance evaluation result."""
-        self.relevance_results.append({
-            "query": query,
-            "result": relevance_result,
-            "metadata": metadata or {}
-        })
+        self._accumulate("relevance_cases", relevance_result, ("overall_relevance", "binary_relevance"))
+        if self.store_results:
+            self._doc_scores.extend(
+                round(min(max(s["score"], 0.0), 1.0) * 255) for s in relevance_result.get("scores", [])
+            )
+            self._doc_score_offsets.append(len(self._doc_scores))
+            
+            if not self.store_reasons:
+                relevance_result = {key: value for key, value in relevance_result.items() if key != "scores"}
+            self.relevance_results.append({
+                "query": query,
+                "result": relevance_result,
+                "metadata": metadata or {}
+            })
+    
+    def doc_scores(self, index: int) -> list[float]:
+        """Per-document relevance scores of the index-th stored relevance result."""
+        start, end = self._doc_score_offsets[index], self._doc_score_offsets[index + 1]
+        return [score / 255 for score in self._doc_scores[start:end]]
     
     def add_faithfulness_result(
         self,
@@ -258,42 +841,52 @@ class LLMJudgeEvaluator:
         metadata: dict | None = None
     ):
         """Add a faithfulness evaluation result."""
-        self.faithfulness_results.append({
-            "query": query,
-            "result": faithfulness_result,
-            "metadata": metadata or {}
-        })
+        self._accumulate("faithfulness_cases", faithfulness_result, ("faithfulness",))
+        if self.store_results:
+            self.faithfulness_results.append({
+                "query": query,
+                "result": faithfulness_result,
+                "metadata": metadata or {}
+            })
+    
+    def run_all(self, cases: list[dict], max_docs: int = 5, reasons: bool | None = None) -> list[dict]:
+        """
+        Judge many cases concurrently and record their results.
+        
+        Args:
+            cases: Dicts with "query" and "retrieved_docs", plus optional
+                "metadata" and "agent_reasoning" (faithfulness is only
+                judged for cases that have reasoning)
+            max_docs: Maximum documents to judge per query
+            reasons: Relevance reasons per document (see judge_relevance)
+        
+        Returns:
+            Relevance results, in the same order as cases
+        """
+        relevance, faithfulness = asyncio.run(_ajudge_cases(cases, max_docs, reasons))
+        
+        for case, relevance_result in zip(cases, relevance):
+            self.add_relevance_result(case["query"], relevance_result, case.get("metadata"))
+        for case, faithfulness_result in faithfulness:
+            self.add_faithfulness_result(case["query"], faithfulness_result, case.get("metadata"))
+        
+        return relevance
     
     def compute_metrics(self) -> dict:
         """Compute aggregate metrics."""
         metrics = {}
         
         # Relevance metrics
-        if self.relevance_results:
-            overall_scores = [
-                r["result"]["overall_relevance"] 
-                for r in self.relevance_results 
-                if r["result"].get("overall_relevance") is not None
-            ]
-            binary_scores = [
-                r["result"]["binary_relevance"] 
-                for r in self.relevance_results 
-                if r["result"].get("binary_relevance") is not None
-            ]
-            
-            metrics["mean_relevance"] = sum(overall_scores) / len(overall_scores) if overall_scores else 0
-            metrics["mean_binary_relevance"] = sum(binary_scores) / len(binary_scores) if binary_scores else 0
-            metrics["relevance_cases"] = len(self.relevance_results)
+        if self._count["relevance_cases"]:
+            metrics["mean_relevance"] = self._mean("overall_relevance")
+            metrics["mean_binary_relevance"] = self._mean("binary_relevance")
+            if self._doc_scores:
+                metrics["mean_doc_relevance"] = sum(self._doc_scores) / (255 * len(self._doc_scores))
+            metrics["relevance_cases"] = self._count["relevance_cases"]
         
         # Faithfulness metrics
-        if self.faithfulness_results:
-            faith_scores = [
-                r["result"]["faithfulness"] 
-                for r in self.faithfulness_results 
-                if r["result"].get("faithfulness") is not None
-            ]
-            
-            metrics["mean_faithfulness"] = sum(faith_scores) / len(faith_scores) if faith_scores else 0
-            metrics["faithfulness_cases"] = len(self.faithfulness_results)
+        if self._count["faithfulness_cases"]:
+            metrics["mean_faithfulness"] = self._mean("faithfulness")
+            metrics["faithfulness_cases"] = self._count["faithfulness_cases"]
         
         return metrics
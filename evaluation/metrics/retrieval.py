@@ -8,8 +8,32 @@ Calculates standard IR metrics:
 - NDCG@K: Normalized Discounted Cumulative Gain
 """
 
-import numpy as np
-from typing import Literal
+import math
+import statistics
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import accumulate
+
+# NDCG rank discounts 1 / log2(rank + 1), precomputed for ranks 1..MAX_K
+MAX_K = 1024
+_DISCOUNT = [1.0 / math.log2(rank + 1) for rank in range(1, MAX_K + 1)]
+# _IDEAL_DCG[m] = DCG with m relevant docs at the top (_IDEAL_DCG[0] = 0)
+_IDEAL_DCG = [0.0, *accumulate(_DISCOUNT)]
+
+
+def _discount(rank: int) -> float:
+    """Discount for a 1-based rank (computed on demand beyond MAX_K)."""
+    if rank <= MAX_K:
+        return _DISCOUNT[rank - 1]
+    return 1.0 / math.log2(rank + 1)
+
+
+def _ideal_dcg(n: int) -> float:
+    """DCG with n relevant docs at the top."""
+    if n <= MAX_K:
+        return _IDEAL_DCG[n]
+    return _IDEAL_DCG[MAX_K] + sum(_discount(rank) for rank in range(MAX_K + 1, n + 1))
 
 
 def recall_at_k(retrieved_ids: list[str], expected_ids: list[str], k: int) -> float:
@@ -27,10 +51,10 @@ def recall_at_k(retrieved_ids: list[str], expected_ids: list[str], k: int) -> fl
     if not expected_ids:
         return 1.0  # No expected docs = perfect recall
     
-    top_k = set(retrieved_ids[:k])
     expected = set(expected_ids)
     
-    hits = len(top_k & expected)
+    # Probe the expected set with the top-k slice instead of hashing both
+    hits = len(expected.intersection(retrieved_ids[:k]))
     return hits / len(expected)
 
 
@@ -84,8 +108,7 @@ def mean_reciprocal_rank(results: list[tuple[list[str], list[str]]]) -> float:
     if not results:
         return 0.0
     
-    rr_sum = sum(reciprocal_rank(retrieved, expected) for retrieved, expected in results)
-    return rr_sum / len(results)
+    return statistics.fmean(reciprocal_rank(retrieved, expected) for retrieved, expected in results)
 
 
 def ndcg_at_k(retrieved_ids: list[str], expected_ids: list[str], k: int) -> float:
@@ -95,15 +118,13 @@ def ndcg_at_k(retrieved_ids: list[str], expected_ids: list[str], k: int) -> floa
     Gives higher scores when relevant docs appear earlier in results.
     """
     expected = set(expected_ids)
+    top_k = retrieved_ids[:k]
     
     # DCG: sum of relevance / log2(rank + 1)
-    dcg = 0.0
-    for rank, doc_id in enumerate(retrieved_ids[:k], start=1):
-        if doc_id in expected:
-            dcg += 1.0 / np.log2(rank + 1)
+    dcg = sum(_discount(rank) for rank, doc_id in enumerate(top_k, start=1) if doc_id in expected)
     
     # Ideal DCG: if all relevant docs were at top
-    ideal_dcg = sum(1.0 / np.log2(i + 2) for i in range(min(len(expected), k)))
+    ideal_dcg = _ideal_dcg(min(len(expected), k))
     
     if ideal_dcg == 0:
         return 1.0  # No relevant docs = perfect by default
@@ -125,22 +146,274 @@ def negative_precision(
     if k == 0:
         return 1.0
     
-    top_k = set(retrieved_ids[:k])
     negative = set(negative_ids)
     
     # Count how many negatives incorrectly appeared
-    false_positives = len(top_k & negative)
+    false_positives = len(negative.intersection(retrieved_ids[:k]))
     
     # Return 1 - (false_positive_rate)
     return 1.0 - (false_positives / k)
 
 
-class RetrievalEvaluator:
-    """Aggregates retrieval metrics across multiple test cases."""
+# Templates for _compile_metrics; ranks are 1-based
+_METRICS_HEAD = """
+def metrics(retrieved_ids, expected_ids):
+    expected = set(expected_ids)
+    n_expected = len(expected)
+    n = len(retrieved_ids)
+    found = set()  # Recall counts each expected ID once
+    hits = 0
+    dcg = 0.0
+    rr = 0.0
+"""
+
+_METRICS_RANKS = """
+    for rank in range({start}, min(n, {stop}) + 1):
+        doc_id = retrieved_ids[rank - 1]
+        if doc_id in expected:
+            if not rr:
+                rr = 1.0 / rank
+            hits += 1
+            dcg += _discount(rank)
+            found.add(doc_id)
+"""
+
+_METRICS_RECORD = """
+    recall_{k} = len(found) / n_expected if n_expected else 1.0
+    precision_{k} = {precision}
+    ideal_dcg = _ideal_dcg(min(n_expected, {k}))
+    ndcg_{k} = dcg / ideal_dcg if ideal_dcg else 1.0
+"""
+
+# Reciprocal rank looks past the largest K
+_METRICS_TAIL = """
+    if not rr:
+        for rank in range({start}, n + 1):
+            if retrieved_ids[rank - 1] in expected:
+                rr = 1.0 / rank
+                break
+"""
+
+
+@lru_cache(maxsize=None)
+def _compile_metrics(ks: tuple[int, ...]):
+    """
+    Generate metrics_at_k specialized to sorted, distinct K values.
+    
+    The rank loop is split at each K and the K values are literals, so there
+    is no per-rank check for which K was reached. Compiled once per ks.
+    """
+    parts = [_METRICS_HEAD]
+    start = 1
+    for k in ks:
+        if k >= start:
+            parts.append(_METRICS_RANKS.format(start=start, stop=k))
+            start = k + 1
+        parts.append(_METRICS_RECORD.format(k=k, precision=f"hits / {k}" if k else "0.0"))
+    parts.append(_METRICS_TAIL.format(start=start))
+    
+    fields = [f'"{name}@{k}": {name}_{k}' for k in ks for name in ("recall", "precision", "ndcg")]
+    fields.append('"mrr": rr')
+    parts.append("\n    return {" + ", ".join(fields) + "}\n")
+    
+    namespace = {"_discount": _discount, "_ideal_dcg": _ideal_dcg}
+    exec("".join(parts), namespace)
+    return namespace["metrics"]
+
+
+def metrics_at_k(
+    retrieved_ids: list[str],
+    expected_ids: list[str],
+    k_values: list[int]
+) -> dict[str, float]:
+    """
+    Calculate Recall, Precision and NDCG at every K, and Reciprocal Rank.
+    
+    Same values as recall_at_k, precision_at_k, ndcg_at_k and reciprocal_rank,
+    but retrieved_ids is walked once: hits and DCG are accumulated by rank
+    and recorded as each K is reached (see _compile_metrics).
+    
+    Returns:
+        Dict keyed like RetrievalEvaluator.compute_metrics ("recall@5", ..., "mrr")
+    """
+    return _compile_metrics(tuple(sorted(set(k_values))))(retrieved_ids, expected_ids)
+
+
+class _ResultColumns:
+    """
+    Retrieval results stored column-wise.
+    
+    Document IDs are mapped to ints as results arrive and kept in flat int64
+    buffers with CSR offsets, so scoring never walks per-result dicts or
+    hashes ID strings again.
+    """
     
     def __init__(self):
-        self.results = []
-        self.negative_results = []
+        self.id_map = {}
+        self.queries = []
+        self.retrieved = array("q")
+        self.retrieved_offsets = array("q", [0])
+        self.expected = array("q")  # Distinct and sorted per result
+        self.expected_offsets = array("q", [0])
+        self.is_negative = array("b")
+        self.metadata = []
+    
+    def __len__(self) -> int:
+        return len(self.queries)
+    
+    def append(
+        self,
+        query: str,
+        retrieved_ids: list[str],
+        expected_ids: list[str],
+        is_negative: bool,
+        metadata: dict
+    ):
+        id_map = self.id_map
+        self.queries.append(query)
+        self.retrieved.extend(id_map.setdefault(doc_id, len(id_map)) for doc_id in retrieved_ids)
+        self.retrieved_offsets.append(len(self.retrieved))
+        self.expected.extend(sorted({id_map.setdefault(doc_id, len(id_map)) for doc_id in expected_ids}))
+        self.expected_offsets.append(len(self.expected))
+        self.is_negative.append(is_negative)
+        self.metadata.append(metadata)
+    
+    def slice(self, start: int, stop: int) -> "_ResultColumns":
+        """Rows start..stop-1 as a new store, for scoring only (IDs keep their codes)."""
+        shard = _ResultColumns()
+        shard.queries = self.queries[start:stop]
+        
+        first, last = self.retrieved_offsets[start], self.retrieved_offsets[stop]
+        shard.retrieved = self.retrieved[first:last]
+        shard.retrieved_offsets = array("q", (offset - first for offset in self.retrieved_offsets[start:stop + 1]))
+        
+        first, last = self.expected_offsets[start], self.expected_offsets[stop]
+        shard.expected = self.expected[first:last]
+        shard.expected_offsets = array("q", (offset - first for offset in self.expected_offsets[start:stop + 1]))
+        
+        shard.is_negative = self.is_negative[start:stop]
+        shard.metadata = self.metadata[start:stop]
+        return shard
+
+
+# Results buffered before a streaming RetrievalEvaluator scores them
+STREAM_BATCH_SIZE = 1024
+
+
+def _add_totals(totals: dict, count_key: str, count: int, sums: dict[str, float]):
+    totals[count_key] = totals.get(count_key, 0) + count
+    for name, value in sums.items():
+        totals[name] = totals.get(name, 0.0) + value
+
+
+def _add_rows(
+    totals: dict,
+    group_totals: dict[str, dict],
+    store: _ResultColumns,
+    rows: range,
+    k_values: list[int]
+):
+    """Pure-Python _add_batch: one metrics_at_k pass per stored result."""
+    for row in rows:
+        retrieved = store.retrieved[store.retrieved_offsets[row]:store.retrieved_offsets[row + 1]]
+        expected = store.expected[store.expected_offsets[row]:store.expected_offsets[row + 1]]
+        
+        if store.is_negative[row]:
+            count_key = "total_negative_cases"
+            values = {"negative_exclusion_rate": negative_precision(retrieved, expected, 10)}
+        else:
+            count_key = "total_positive_cases"
+            values = metrics_at_k(retrieved, expected, k_values)
+        
+        _add_totals(totals, count_key, 1, values)
+        for group_key, groups in group_totals.items():
+            group = store.metadata[row].get(group_key, "unknown")
+            _add_totals(groups.setdefault(group, {}), count_key, 1, values)
+
+
+def _add_batch(
+    totals: dict,
+    group_totals: dict[str, dict],
+    store: _ResultColumns,
+    rows: range,
+    k_values: list[int]
+):
+    """
+    Score stored rows into running totals.
+    
+    Uses the batched NumPy kernels, imported on first use; without NumPy
+    each result is scored by metrics_at_k instead.
+    """
+    try:
+        from ._batched import add_batch
+    except ImportError:
+        add_batch = _add_rows
+    add_batch(totals, group_totals, store, rows, k_values)
+
+
+# Stored results below which grouped metrics are never split across processes
+PARALLEL_MIN_RESULTS = 10_000
+
+
+def _score_groups(store: _ResultColumns, group_key: str, k_values: list[int]) -> dict[str, dict]:
+    """Per-group totals for a whole store (top level so worker processes can run it)."""
+    groups = {}
+    _add_batch({}, {group_key: groups}, store, range(len(store)), k_values)
+    return groups
+
+
+def _summarize(totals: dict, k_values: list[int]) -> dict:
+    """Turn running totals into the metrics dict returned by compute_metrics."""
+    metrics = {}
+    n_positive = totals.get("total_positive_cases", 0)
+    n_negative = totals.get("total_negative_cases", 0)
+    
+    # Positive cases
+    for k in k_values:
+        for name in (f"recall@{k}", f"precision@{k}", f"ndcg@{k}"):
+            metrics[name] = totals[name] / n_positive if n_positive else 0.0
+    metrics["mrr"] = totals["mrr"] / n_positive if n_positive else 0.0
+    
+    if n_negative:
+        metrics["negative_exclusion_rate"] = totals["negative_exclusion_rate"] / n_negative
+    
+    # Counts
+    metrics["total_positive_cases"] = n_positive
+    metrics["total_negative_cases"] = n_negative
+    
+    return metrics
+
+
+class RetrievalEvaluator:
+    """
+    Aggregates retrieval metrics across multiple test cases.
+    
+    Results are stored column-wise (see _ResultColumns). Given k_values up front, results are scored in batches as they arrive and
+    only running totals are kept (overall and per group_keys), so memory no
+    longer grows with the number of cases once store_results is False.
+    """
+    
+    def __init__(
+        self,
+        k_values: list[int] | None = None,
+        group_keys: list[str] | None = None,
+        store_results: bool = True
+    ):
+        """
+        Args:
+            k_values: K values to aggregate while streaming (None = score on demand)
+            group_keys: Metadata keys to keep per-group totals for while streaming
+            store_results: Keep raw results, needed for other K values or group keys
+        """
+        if not store_results and k_values is None:
+            raise ValueError("k_values are required when store_results is False")
+        
+        self.k_values = k_values
+        self.store_results = store_results
+        self._store = _ResultColumns()
+        self._flushed = 0  # Stored rows already in the running totals
+        self._totals = {}
+        self._group_totals = {group_key: {} for group_key in group_keys or []} if k_values is not None else {}
     
     def add_result(
         self, 
@@ -151,82 +424,77 @@ class RetrievalEvaluator:
         metadata: dict | None = None
     ):
         """Add a single evaluation result."""
-        result = {
-            "query": query,
-            "retrieved_ids": retrieved_ids,
-            "expected_ids": expected_ids,
-            "is_negative": is_negative,
-            "metadata": metadata or {}
-        }
+        self._store.append(query, retrieved_ids, expected_ids, is_negative, metadata or {})
         
-        if is_negative:
-            self.negative_results.append(result)
+        if self.k_values is not None and len(self._store) - self._flushed >= STREAM_BATCH_SIZE:
+            self._flush()
+    
+    def _flush(self):
+        """Score rows added since the last flush into the running totals."""
+        if len(self._store) > self._flushed:
+            rows = range(self._flushed, len(self._store))
+            _add_batch(self._totals, self._group_totals, self._store, rows, self.k_values)
+            if self.store_results:
+                self._flushed = len(self._store)
+            else:
+                self._store = _ResultColumns()
+    
+    def _streamed(self, k_values: list[int], group_key: str | None = None) -> bool:
+        """Whether the running totals can answer for these K values (and group key)."""
+        if self.k_values is None or not set(k_values) <= set(self.k_values):
+            streamed = False
         else:
-            self.results.append(result)
+            streamed = group_key is None or group_key in self._group_totals
+        
+        if not streamed and not self.store_results:
+            raise ValueError(
+                f"Results were not stored; only k_values={self.k_values} and "
+                f"group_keys={list(self._group_totals)} are available"
+            )
+        return streamed
     
     def compute_metrics(self, k_values: list[int] = [5, 10]) -> dict:
         """Compute all metrics."""
-        metrics = {}
+        if self._streamed(k_values):
+            self._flush()
+            return _summarize(self._totals, k_values)
         
-        # Positive cases
-        for k in k_values:
-            recalls = [
-                recall_at_k(r["retrieved_ids"], r["expected_ids"], k) 
-                for r in self.results
-            ]
-            precisions = [
-                precision_at_k(r["retrieved_ids"], r["expected_ids"], k) 
-                for r in self.results
-            ]
-            ndcgs = [
-                ndcg_at_k(r["retrieved_ids"], r["expected_ids"], k) 
-                for r in self.results
-            ]
-            
-            metrics[f"recall@{k}"] = np.mean(recalls) if recalls else 0.0
-            metrics[f"precision@{k}"] = np.mean(precisions) if precisions else 0.0
-            metrics[f"ndcg@{k}"] = np.mean(ndcgs) if ndcgs else 0.0
-        
-        # MRR
-        if self.results:
-            rr_pairs = [(r["retrieved_ids"], r["expected_ids"]) for r in self.results]
-            metrics["mrr"] = mean_reciprocal_rank(rr_pairs)
-        else:
-            metrics["mrr"] = 0.0
-        
-        # Negative precision
-        if self.negative_results:
-            neg_precisions = [
-                negative_precision(r["retrieved_ids"], r["expected_ids"], 10) 
-                for r in self.negative_results
-            ]
-            metrics["negative_exclusion_rate"] = np.mean(neg_precisions)
-        
-        # Counts
-        metrics["total_positive_cases"] = len(self.results)
-        metrics["total_negative_cases"] = len(self.negative_results)
-        
-        return metrics
+        totals = {}
+        _add_batch(totals, {}, self._store, range(len(self._store)), k_values)
+        return _summarize(totals, k_values)
     
     def compute_metrics_by_group(
         self, 
         group_key: str, 
-        k_values: list[int] = [5, 10]
+        k_values: list[int] = [5, 10],
+        workers: int = 1
     ) -> dict[str, dict]:
-        """Compute metrics grouped by a metadata key (e.g., 'difficulty', 'collection')."""
-        groups = {}
+        """
+        Compute metrics grouped by a metadata key (e.g., 'difficulty', 'collection').
         
-        for result in self.results + self.negative_results:
-            group = result["metadata"].get(group_key, "unknown")
-            if group not in groups:
-                groups[group] = RetrievalEvaluator()
-            
-            groups[group].add_result(
-                query=result["query"],
-                retrieved_ids=result["retrieved_ids"],
-                expected_ids=result["expected_ids"],
-                is_negative=result["is_negative"],
-                metadata=result["metadata"]
-            )
+        With workers > 1 and at least PARALLEL_MIN_RESULTS stored results,
+        stored results are scored in contiguous shards across a process pool
+        and the per-group totals are summed.
+        """
+        if self._streamed(k_values, group_key):
+            self._flush()
+            groups = self._group_totals[group_key]
+        elif workers > 1 and len(self._store) >= PARALLEL_MIN_RESULTS:
+            shard_size = -(-len(self._store) // workers)
+            shards = [
+                self._store.slice(start, min(start + shard_size, len(self._store)))
+                for start in range(0, len(self._store), shard_size)
+            ]
+            groups = {}
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for shard_groups in executor.map(
+                    _score_groups, shards, [group_key] * len(shards), [k_values] * len(shards)
+                ):
+                    for group, shard_totals in shard_groups.items():
+                        totals = groups.setdefault(group, {})
+                        for name, value in shard_totals.items():
+                            totals[name] = totals.get(name, 0) + value
+        else:
+            groups = _score_groups(self._store, group_key, k_values)
         
-        return {group: evaluator.compute_metrics(k_values) for group, evaluator in groups.items()}
+        return {group: _summarize(totals, k_values) for group, totals in groups.items()}
@@ -16,19 +16,41 @@ Features:
 """
 
 import json
+import os
 import time
 import argparse
+import asyncio
 import sys
+from functools import lru_cache, partial
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Literal
 
+import orjson
+from dotenv import load_dotenv
+
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Load .env first so its settings win over the defaults below
+load_dotenv()
+
+# Golden queries repeat across runs: reuse their embeddings from disk
+os.environ.setdefault("FAIRTRACE_EMBED_CACHE", "1")
+# gRPC multiplexes the concurrent searches over one channel (port 6334);
+# set QDRANT_PREFER_GRPC=0 where only the REST port is reachable
+os.environ.setdefault("QDRANT_PREFER_GRPC", "1")
+
 from tqdm import tqdm
-from evaluation.metrics import RetrievalEvaluator, judge_relevance, LLMJudgeEvaluator
-from tools.qdrant_retriever import hybrid_search, embed_query
+from evaluation.metrics import RetrievalEvaluator, ajudge_relevance, LLMJudgeEvaluator
+from evaluation.metrics.llm_judge import (
+    JUDGE_KEEP_ALIVE,
+    JUDGE_MODEL,
+    JUDGE_TIMEOUT,
+    OLLAMA_HOST,
+    OLLAMA_NUM_PARALLEL
+)
+from tools.qdrant_retriever import QUERY_BATCH_SIZE, hybrid_search, hybrid_search_batch, embed_query
 
 EVAL_DIR = Path(__file__).parent
 GOLDEN_FILE = EVAL_DIR / "golden_qa.json"
@@ -37,16 +59,21 @@ REPORTS_DIR = EVAL_DIR / "reports"
 # Query expansion model (Qwen 3b for speed)
 QUERY_EXPAND_MODEL = "qwen2.5:3b-instruct-q8_0"
 
+# Retrieval tests in flight at once; a few concurrent searches keep Qdrant
+# and the embedder busy without saturating the server
+RETRIEVAL_CONCURRENCY = int(os.getenv("FAIRTRACE_EVAL_CONCURRENCY", "8"))
+
+# Retrieved cases waiting for a judge; bounds how far retrieval runs ahead
+JUDGE_QUEUE_SIZE = 16
+
+# Fusion weights used for every evaluation search
+SEARCH_WEIGHTS = {"structured": 0.4, "narrative": 0.4, "keywords": 0.2}
+
+_query_parser = None
 
-def expand_query(query: str) -> str:
-    """
-    Use LLM to expand/rewrite query for better retrieval.
-    
-    Generates alternative phrasings and related terms.
-    """
-    import ollama
-    
-    system_prompt = """You are a query expansion expert for a credit/finance retrieval system.
+
+# Sent unchanged with every expansion, so Ollama can reuse its KV cache
+QUERY_EXPAND_SYSTEM_PROMPT = """You are a query expansion expert for a credit/finance retrieval system.
 
 Given a search query, expand it by adding:
 1. Synonyms and alternative phrasings
@@ -55,20 +82,36 @@ Given a search query, expand it by adding:
 
 Output ONLY the expanded query, nothing else. Keep it concise (under 200 words)."""
 
+
+@lru_cache(maxsize=4096)
+def _expand_query_llm(query: str) -> str:
+    """Ask the expansion model once per distinct query (failures aren't cached)."""
+    import ollama
+    
     user_message = f"""Original query: {query}
 
 Expanded query:"""
     
+    # Single-turn /api/generate: no chat history to re-template per call
+    response = ollama.generate(
+        model=QUERY_EXPAND_MODEL,
+        system=QUERY_EXPAND_SYSTEM_PROMPT,
+        prompt=user_message,
+        options={"temperature": 0.3, "num_predict": 200},
+        keep_alive=JUDGE_KEEP_ALIVE  # Stay loaded between expansions
+    )
+    return response["response"].strip()
+
+
+def expand_query(query: str) -> str:
+    """
+    Use LLM to expand/rewrite query for better retrieval.
+    
+    Generates alternative phrasings and related terms. Repeated queries
+    reuse their first expansion, so they also retrieve the same results.
+    """
     try:
-        response = ollama.chat(
-            model=QUERY_EXPAND_MODEL,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            options={"temperature": 0.3, "num_predict": 200}
-        )
-        expanded = response["message"]["content"].strip()
+        expanded = _expand_query_llm(query)
         return expanded if expanded else query
     except Exception as e:
         print(f"⚠️ Query expansion failed: {e}")
@@ -96,39 +139,117 @@ def load_golden_cases(
     if limit:
         cases = cases[:limit]
     
+    # Hashed once here, reused by every retrieval test and debug check
+    for case in cases:
+        case["_expected_set"] = frozenset(case["expected_ids"])
+    
     return cases
 
 
+def _get_query_parser():
+    """The Query Parser singleton, imported on first use (it loads LangChain)."""
+    global _query_parser
+    if _query_parser is None:
+        from tools.query_parser import get_query_parser
+        _query_parser = get_query_parser()
+    return _query_parser
+
+
+@lru_cache(maxsize=2048)
+def _parse_filters(query: str) -> dict | None:
+    """
+    Metadata filters extracted by the Query Parser (None if parsing fails).
+    
+    Parsed once per distinct query; the returned filters are shared, so
+    callers must not modify them.
+    """
+    try:
+        parser = _get_query_parser()
+        parse_result = parser.parse(query)
+        # Only use if confidence/valid filters found? 
+        # The parser returns collection and filters.
+        # We should respect the parser's collection choice too if we wanted, 
+        # but for this test we stick to the test case collection unless filter is specific.
+        # Actually, let's just use the filters.
+        return parse_result.get("filters")
+    except Exception:
+        return None  # Fallback to standard search
+
+
+def _retrieval_result(
+    response: dict,
+    expected_set: frozenset[str],
+    is_negative: bool,
+    latency_ms: float | None,
+    return_raw_docs: bool
+) -> dict:
+    """Score one search response against the case's expected IDs."""
+    # Extract IDs (raw docs are kept only for the LLM judge)
+    retrieved_ids = []
+    raw_docs = response.get("results", [])
+    
+    for result in raw_docs:
+        payload = result.get("payload", {})
+        entity_id = (
+            payload.get("client_id") or 
+            payload.get("startup_id") or 
+            payload.get("enterprise_id") or 
+            str(result.get("id", ""))
+        )
+        retrieved_ids.append(entity_id)
+    
+    # Check if expected IDs were found
+    found = not expected_set.isdisjoint(retrieved_ids)
+    
+    if is_negative:
+        # For negative cases, success = expected IDs NOT in results
+        success = not found
+    else:
+        # For positive cases, success = at least one expected ID in results
+        success = found
+    
+    return {
+        "success": success,
+        "retrieved_ids": retrieved_ids,
+        "raw_docs": raw_docs if return_raw_docs else [],
+        "latency_ms": latency_ms,
+        "cache_hit": response.get("cache_hit", False),
+        "error": None
+    }
+
+
+def _failed_result(error: Exception, latency_ms: float | None) -> dict:
+    """Result for a retrieval test whose search raised."""
+    return {
+        "success": False,
+        "retrieved_ids": [],
+        "raw_docs": [],
+        "latency_ms": latency_ms,
+        "cache_hit": False,
+        "error": str(error)
+    }
+
+
 def run_retrieval_test(
     query: str,
     collection: str,
-    expected_ids: list[str],
+    expected_set: frozenset[str],
     is_negative: bool = False,
     limit: int = 10,
     rerank: bool = False,
-    use_parser: bool = False
+    use_parser: bool = False,
+    return_raw_docs: bool = False
 ) -> dict:
     """
     Run a single retrieval test.
     
-    Returns dict with retrieved_ids, raw docs, latency, and whether expected docs were found.
+    Returns dict with retrieved_ids, raw docs (only if return_raw_docs, as the
+    payloads are only needed by the LLM judge), latency, and whether expected
+    docs were found.
     """
-    filters = None
-    if use_parser:
-        from tools.query_parser import get_query_parser
-        try:
-            parser = get_query_parser()
-            parse_result = parser.parse(query)
-            # Only use if confidence/valid filters found? 
-            # The parser returns collection and filters.
-            # We should respect the parser's collection choice too if we wanted, 
-            # but for this test we stick to the test case collection unless filter is specific.
-            # Actually, let's just use the filters.
-            filters = parse_result.get("filters")
-        except Exception:
-            pass # Fallback to standard search
-
-    start = time.time()
+    filters = _parse_filters(query) if use_parser else None
+
+    start = time.perf_counter_ns()
     
     try:
         # Run hybrid search
@@ -136,58 +257,159 @@ def run_retrieval_test(
             collection=collection,
             query_text=query,
             limit=limit,
-            weights={"structured": 0.4, "narrative": 0.4, "keywords": 0.2},
+            weights=SEARCH_WEIGHTS,
             rerank=rerank,
             rerank_top_k=50 if rerank else None,
             filters=filters
         )
         
-        latency_ms = (time.time() - start) * 1000
-        
-        # Extract IDs and keep raw docs for LLM judge
-        retrieved_ids = []
-        raw_docs = response.get("results", [])
-        
-        for result in raw_docs:
-            payload = result.get("payload", {})
-            entity_id = (
-                payload.get("client_id") or 
-                payload.get("startup_id") or 
-                payload.get("enterprise_id") or 
-                str(result.get("id", ""))
-            )
-            retrieved_ids.append(entity_id)
+        latency_ms = (time.perf_counter_ns() - start) / 1e6
+        return _retrieval_result(response, expected_set, is_negative, latency_ms, return_raw_docs)
         
-        # Check if expected IDs were found
-        expected_set = set(expected_ids)
-        retrieved_set = set(retrieved_ids)
+    except Exception as e:
+        return _failed_result(e, (time.perf_counter_ns() - start) / 1e6)
+
+
+def run_retrieval_batch(
+    cases: list[dict],
+    limit: int = 10,
+    use_parser: bool = False
+) -> tuple[list[dict], float]:
+    """
+    Run retrieval tests for cases of one collection as a single Qdrant batch.
+    
+    Returns:
+        One run_retrieval_test-style result per case (without raw docs, and
+        with latency_ms None: the queries run together), and the batch's
+        wall-clock latency in ms
+    """
+    queries = [case["query"] for case in cases]
+    filters = [_parse_filters(query) for query in queries] if use_parser else None
+    
+    start = time.perf_counter_ns()
+    
+    try:
+        responses = hybrid_search_batch(
+            collection=cases[0]["collection"],
+            query_texts=queries,
+            limit=limit,
+            filters=filters,
+            weights=SEARCH_WEIGHTS
+        )
+    except Exception as e:
+        return [_failed_result(e, None) for _ in cases], (time.perf_counter_ns() - start) / 1e6
+    
+    batch_ms = (time.perf_counter_ns() - start) / 1e6
+    return [
+        _retrieval_result(
+            response, case["_expected_set"], case.get("is_negative", False),
+            None, return_raw_docs=False
+        )
+        for case, response in zip(cases, responses)
+    ], batch_ms
+
+
+def _latency_stats(latencies: list[float], percentiles: tuple[int, ...]) -> dict:
+    """
+    Nearest-rank percentiles (p50_ms, ...), mean_ms and total_ms of latencies.
+    
+    The latencies are sorted once for all percentiles.
+    """
+    if not latencies:
+        return {**{f"p{p}_ms": 0 for p in percentiles}, "mean_ms": 0, "total_ms": 0}
+    
+    ordered = sorted(latencies)
+    n = len(ordered)
+    total = sum(ordered)
+    return {
+        **{f"p{p}_ms": ordered[n * p // 100] for p in percentiles},
+        "mean_ms": total / n,
+        "total_ms": total
+    }
+
+
+async def _gather_bounded(jobs: list, limit: int, desc: str) -> list:
+    """
+    Run blocking jobs in worker threads, at most limit at a time.
+    
+    Returns their results in the same order as jobs.
+    """
+    semaphore = asyncio.Semaphore(limit)
+    
+    with tqdm(total=len(jobs), desc=desc) as progress:
+        async def run(job):
+            async with semaphore:
+                result = await asyncio.to_thread(job)
+            progress.update()
+            return result
         
-        if is_negative:
-            # For negative cases, success = expected IDs NOT in results
-            success = len(expected_set & retrieved_set) == 0
-        else:
-            # For positive cases, success = at least one expected ID in results
-            success = len(expected_set & retrieved_set) > 0
+        return await asyncio.gather(*(run(job) for job in jobs))
+
+
+async def _retrieve_and_judge(
+    cases: list[dict],
+    retrieve,
+    max_docs: int
+) -> list[tuple]:
+    """
+    Retrieve and judge cases as a two-stage pipeline.
+    
+    Retrievals (blocking, in threads, RETRIEVAL_CONCURRENCY at a time) feed a
+    bounded queue drained by OLLAMA_NUM_PARALLEL judge workers, so judging
+    starts with the first retrieved case and the two stages overlap.
+    
+    Args:
+        cases: Evaluation cases
+        retrieve: Blocking callable, case -> (retrieval result, expansion ms)
+        max_docs: Maximum documents to judge per query
+    
+    Returns:
+        (retrieval result, expansion ms, relevance result, judge ms) per case,
+        in order; the judge fields are None when retrieval or judging failed
+        (the retrieval result's error says which)
+    """
+    import ollama
+    
+    # One pooled client per event loop, shared by every judgment
+    client = ollama.AsyncClient(host=OLLAMA_HOST, timeout=JUDGE_TIMEOUT)
+    retrieval_slots = asyncio.Semaphore(RETRIEVAL_CONCURRENCY)
+    queue = asyncio.Queue(maxsize=JUDGE_QUEUE_SIZE)  # Indices of retrieved cases
+    outcomes = [None] * len(cases)
+    
+    with tqdm(total=len(cases), desc="LLM Judging") as progress:
+        async def produce(index: int, case: dict):
+            async with retrieval_slots:
+                result, expand_ms = await asyncio.to_thread(retrieve, case)
+            outcomes[index] = (result, expand_ms, None, None)
+            if result["error"]:
+                progress.update()
+            else:
+                await queue.put(index)
         
-        return {
-            "success": success,
-            "retrieved_ids": retrieved_ids,
-            "raw_docs": raw_docs,  # For LLM judge
-            "latency_ms": latency_ms,
-            "cache_hit": response.get("cache_hit", False),
-            "error": None
-        }
+        async def consume():
+            while (index := await queue.get()) is not None:
+                result, expand_ms, _, _ = outcomes[index]
+                llm_start = time.perf_counter_ns()
+                try:
+                    relevance_result = await ajudge_relevance(
+                        cases[index]["query"], result["raw_docs"], max_docs, client=client
+                    )
+                    outcomes[index] = (result, expand_ms, relevance_result, (time.perf_counter_ns() - llm_start) / 1e6)
+                except Exception as e:
+                    # A dead worker would leave the producers blocked on the
+                    # full queue: record the case as failed and keep going
+                    result["error"] = f"Judge failed: {e}"
+                finally:
+                    result["raw_docs"] = []  # Judged: free the payloads
+                    progress.update()
         
-    except Exception as e:
-        latency_ms = (time.time() - start) * 1000
-        return {
-            "success": False,
-            "retrieved_ids": [],
-            "raw_docs": [],
-            "latency_ms": latency_ms,
-            "cache_hit": False,
-            "error": str(e)
-        }
+        consumers = [asyncio.create_task(consume()) for _ in range(OLLAMA_NUM_PARALLEL)]
+        await asyncio.gather(*(produce(index, case) for index, case in enumerate(cases)))
+        for _ in consumers:
+            await queue.put(None)  # Stop each worker once the queue drains
+        await asyncio.gather(*consumers)
+    
+    return outcomes
 
 
 def run_evaluation(
@@ -201,26 +423,74 @@ def run_evaluation(
     
     Returns comprehensive metrics report.
     """
-    evaluator = RetrievalEvaluator()
+    # Stream metrics instead of keeping every result (only these groupings are reported)
+    evaluator = RetrievalEvaluator(
+        k_values=k_values,
+        group_keys=["difficulty", "collection"],
+        store_results=False
+    )
     
-    latencies = []
+    latencies = []  # Per search (rerank mode)
+    batch_latencies = []  # Per query_batch_points request (standard mode)
     errors = []
     cache_hits = 0
     
+    # Cases repeating a (query, collection) pair (filters are parsed from the
+    # query) share one search; the first occurrence stands for the rest
+    first_index = {}
+    for index, case in enumerate(cases):
+        first_index.setdefault((case["query"], case["collection"]), index)
+    searched = [cases[index] for index in first_index.values()]
+    
     mode_str = "🔄 reranking" if rerank else "🔍 standard"
-    print(f"\n{mode_str} Running {len(cases)} retrieval tests...\n")
+    print(f"\n{mode_str} Running {len(cases)} retrieval tests ({len(searched)} distinct searches)...\n")
+    
+    limit = max(k_values) if k_values else 10
+    
+    # Searches are network-bound, so run them concurrently
+    if rerank:
+        # The reranker needs each query's own candidates: one search per case
+        results = asyncio.run(_gather_bounded([
+            partial(
+                run_retrieval_test,
+                query=case["query"],
+                collection=case["collection"],
+                expected_set=case["_expected_set"],
+                is_negative=case.get("is_negative", False),
+                limit=limit,
+                rerank=rerank,
+                use_parser=use_parser
+            )
+            for case in searched
+        ], RETRIEVAL_CONCURRENCY, "Evaluating"))
+    else:
+        # One query_batch_points request per collection chunk
+        by_collection = {}
+        for index, case in enumerate(searched):
+            by_collection.setdefault(case["collection"], []).append(index)
+        batches = [
+            indices[start:start + QUERY_BATCH_SIZE]
+            for indices in by_collection.values()
+            for start in range(0, len(indices), QUERY_BATCH_SIZE)
+        ]
+        
+        batch_results = asyncio.run(_gather_bounded([
+            partial(run_retrieval_batch, [searched[index] for index in batch], limit, use_parser)
+            for batch in batches
+        ], RETRIEVAL_CONCURRENCY, "Evaluating batches"))
+        
+        results = [None] * len(searched)
+        for batch, (batch_result, batch_ms) in zip(batches, batch_results):
+            batch_latencies.append(batch_ms)
+            for index, result in zip(batch, batch_result):
+                results[index] = result
+    
+    results = dict(zip(first_index, results))
     
     debug_count = 0
-    for case in tqdm(cases, desc="Evaluating"):
-        result = run_retrieval_test(
-            query=case["query"],
-            collection=case["collection"],
-            expected_ids=case["expected_ids"],
-            is_negative=case.get("is_negative", False),
-            limit=max(k_values) if k_values else 10,
-            rerank=rerank,
-            use_parser=use_parser
-        )
+    for index, case in enumerate(cases):
+        key = (case["query"], case["collection"])
+        result = results[key]
         
         # Debug: Show first 3 cases
         if debug_count < 3:
@@ -228,7 +498,7 @@ def run_evaluation(
             print(f"    Query: {case['query'][:50]}...")
             print(f"    Expected IDs: {case['expected_ids']}")
             print(f"    Retrieved IDs: {result['retrieved_ids'][:5]}")
-            print(f"    Match: {set(case['expected_ids']) & set(result['retrieved_ids'])}")
+            print(f"    Match: {case['_expected_set'].intersection(result['retrieved_ids'])}")
             debug_count += 1
         
         evaluator.add_result(
@@ -244,7 +514,11 @@ def run_evaluation(
             }
         )
         
-        latencies.append(result["latency_ms"])
+        if index != first_index[key]:
+            continue  # Reused result: its search is already counted
+        
+        if result["latency_ms"] is not None:
+            latencies.append(result["latency_ms"])
         if result["cache_hit"]:
             cache_hits += 1
         if result["error"]:
@@ -255,29 +529,43 @@ def run_evaluation(
     metrics_by_difficulty = evaluator.compute_metrics_by_group("difficulty", k_values)
     metrics_by_collection = evaluator.compute_metrics_by_group("collection", k_values)
     
-    # Latency stats
-    latency_stats = {
-        "p50_ms": sorted(latencies)[len(latencies) // 2] if latencies else 0,
-        "p95_ms": sorted(latencies)[int(len(latencies) * 0.95)] if latencies else 0,
-        "p99_ms": sorted(latencies)[int(len(latencies) * 0.99)] if latencies else 0,
-        "mean_ms": sum(latencies) / len(latencies) if latencies else 0,
-        "total_s": sum(latencies) / 1000
-    }
-    
     report = {
         "timestamp": datetime.now(timezone.utc).isoformat(),
         "total_cases": len(cases),
-        "cache_hit_rate": cache_hits / len(cases) if cases else 0,
+        "distinct_searches": len(searched),
+        "cache_hit_rate": cache_hits / len(searched) if searched else 0,
         "error_count": len(errors),
         "metrics": {
             "overall": overall_metrics,
             "by_difficulty": metrics_by_difficulty,
             "by_collection": metrics_by_collection
         },
-        "latency": latency_stats,
         "errors": errors[:10]  # First 10 errors only
     }
     
+    # Latency stats: batched queries have no per-query latency, so standard
+    # mode reports per-batch samples under their own key
+    if rerank:
+        retrieval = _latency_stats(latencies, (50, 95, 99))
+        report["latency"] = {
+            "p50_ms": retrieval["p50_ms"],
+            "p95_ms": retrieval["p95_ms"],
+            "p99_ms": retrieval["p99_ms"],
+            "mean_ms": retrieval["mean_ms"],
+            "total_s": retrieval["total_ms"] / 1000
+        }
+    else:
+        batch = _latency_stats(batch_latencies, (50, 95, 99))
+        report["batch_latency"] = {
+            "batches": len(batch_latencies),
+            "queries_per_batch": len(searched) / len(batch_latencies) if batch_latencies else 0,
+            "p50_ms": batch["p50_ms"],
+            "p95_ms": batch["p95_ms"],
+            "p99_ms": batch["p99_ms"],
+            "mean_ms": batch["mean_ms"],
+            "total_s": batch["total_ms"] / 1000
+        }
+    
     return report
 
 
@@ -292,7 +580,7 @@ def run_llm_judge_evaluation(
     
     Uses Qwen2.5:7b via Ollama (fully local, no API costs).
     """
-    judge_evaluator = LLMJudgeEvaluator()
+    judge_evaluator = LLMJudgeEvaluator(store_results=False)
     
     latencies = []
     llm_latencies = []
@@ -301,30 +589,42 @@ def run_llm_judge_evaluation(
     expand_latencies = []
     
     print(f"\n🤖 Running {len(cases)} LLM-as-Judge evaluations...")
-    print(f"   Model: qwen2.5:7b (local via Ollama)")
+    print(f"   Model: {JUDGE_MODEL} (local via Ollama)")
     if query_expand:
         print(f"   Query Expansion: enabled (qwen2.5:3b)")
     if rerank:
         print(f"   Reranking: enabled (mxbai-rerank-base-v2)")
     print()
     
-    for case in tqdm(cases, desc="LLM Judging"):
+    def expand_and_retrieve(case: dict) -> tuple[dict, float | None]:
         # Optional query expansion
         query = case["query"]
+        expand_ms = None
         if query_expand:
-            expand_start = time.time()
+            expand_start = time.perf_counter_ns()
             query = expand_query(query)
-            expand_latencies.append((time.time() - expand_start) * 1000)
+            expand_ms = (time.perf_counter_ns() - expand_start) / 1e6
         
         # Run retrieval
         result = run_retrieval_test(
             query=query,
             collection=case["collection"],
-            expected_ids=case["expected_ids"],
+            expected_set=case["_expected_set"],
             is_negative=case.get("is_negative", False),
             limit=10,
-            rerank=rerank
+            rerank=rerank,
+            return_raw_docs=True
         )
+        return result, expand_ms
+    
+    # Retrieval and judging overlap (Ollama serves OLLAMA_NUM_PARALLEL requests at once)
+    pipeline_start = time.perf_counter_ns()
+    outcomes = asyncio.run(_retrieve_and_judge(cases, expand_and_retrieve, max_docs_per_query))
+    pipeline_s = (time.perf_counter_ns() - pipeline_start) / 1e9
+    
+    for case, (result, expand_ms, relevance_result, llm_ms) in zip(cases, outcomes):
+        if expand_ms is not None:
+            expand_latencies.append(expand_ms)
         
         latencies.append(result["latency_ms"])
         if result["cache_hit"]:
@@ -334,14 +634,7 @@ def run_llm_judge_evaluation(
             errors.append({"query": case["query"], "error": result["error"]})
             continue
         
-        # Run LLM judge
-        llm_start = time.time()
-        relevance_result = judge_relevance(
-            query=case["query"],
-            retrieved_docs=result["raw_docs"],
-            max_docs=max_docs_per_query
-        )
-        llm_latencies.append((time.time() - llm_start) * 1000)
+        llm_latencies.append(llm_ms)
         
         if relevance_result.get("error"):
             errors.append({"query": case["query"], "error": relevance_result["error"]})
@@ -360,12 +653,17 @@ def run_llm_judge_evaluation(
     llm_metrics = judge_evaluator.compute_metrics()
     
     # Latency stats
+    retrieval = _latency_stats(latencies, (50,))
+    llm_judge = _latency_stats(llm_latencies, (50,))
     latency_stats = {
-        "retrieval_p50_ms": sorted(latencies)[len(latencies) // 2] if latencies else 0,
-        "retrieval_mean_ms": sum(latencies) / len(latencies) if latencies else 0,
-        "llm_judge_p50_ms": sorted(llm_latencies)[len(llm_latencies) // 2] if llm_latencies else 0,
-        "llm_judge_mean_ms": sum(llm_latencies) / len(llm_latencies) if llm_latencies else 0,
-        "total_s": (sum(latencies) + sum(llm_latencies)) / 1000
+        "retrieval_p50_ms": retrieval["p50_ms"],
+        "retrieval_mean_ms": retrieval["mean_ms"],
+        "llm_judge_p50_ms": llm_judge["p50_ms"],
+        "llm_judge_mean_ms": llm_judge["mean_ms"],
+        # Wall clock: the stages overlap, so their sums exceed it
+        "total_s": pipeline_s,
+        "retrieval_total_s": retrieval["total_ms"] / 1000,
+        "llm_judge_total_s": llm_judge["total_ms"] / 1000
     }
     
     report = {
@@ -409,7 +707,7 @@ def print_llm_judge_report(report: dict):
     lat = report["latency"]
     print(f"  Retrieval P50:  {lat.get('retrieval_p50_ms', 0):.0f}ms")
     print(f"  LLM Judge P50:  {lat.get('llm_judge_p50_ms', 0):.0f}ms")
-    print(f"  Total Time:     {lat.get('total_s', 0):.1f}s")
+    print(f"  Total Time:     {lat.get('total_s', 0):.1f}s (overlapped stages: retrieval {lat.get('retrieval_total_s', 0):.1f}s, judge {lat.get('llm_judge_total_s', 0):.1f}s)")
     
     print("\n" + "=" * 60)
 
@@ -461,9 +759,13 @@ def print_report(report: dict):
     
     # Latency
     print("\n" + "-" * 40)
-    print("⏱️  LATENCY")
+    if "batch_latency" in report:
+        lat = report["batch_latency"]
+        print(f"⏱️  BATCH LATENCY ({lat['batches']} batches, {lat['queries_per_batch']:.1f} queries each)")
+    else:
+        lat = report["latency"]
+        print("⏱️  LATENCY")
     print("-" * 40)
-    lat = report["latency"]
     print(f"  P50:   {lat['p50_ms']:.0f}ms")
     print(f"  P95:   {lat['p95_ms']:.0f}ms")
     print(f"  P99:   {lat['p99_ms']:.0f}ms")
@@ -480,8 +782,11 @@ def save_report(report: dict):
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     report_path = REPORTS_DIR / f"report_{timestamp}.json"
     
-    with open(report_path, "w") as f:
-        json.dump(report, f, indent=2)
+    # orjson also writes NumPy scalars/arrays and datetimes without conversion
+    report_path.write_bytes(orjson.dumps(
+        report,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+    ))
     
     print(f"\n✅ Report saved to: {report_path}")
     return report_path
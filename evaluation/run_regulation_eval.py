@@ -17,22 +17,36 @@ Usage:
     python evaluation/run_regulation_eval.py --retrieval-only   # Skip LLM judge
     python evaluation/run_regulation_eval.py --rerank           # Enable reranking
     python evaluation/run_regulation_eval.py --output results.json
+    python evaluation/run_regulation_eval.py --output results.json --resume   # Continue interrupted run
 """
 
 import argparse
-import json
+import asyncio
 import os
 import sys
 import time
 from pathlib import Path
-from typing import Literal
-
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from typing import Callable, Literal
 
 from dotenv import load_dotenv
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Load .env first so its settings win over the defaults below
 load_dotenv()
 
+# Golden questions repeat across runs: reuse their embeddings from disk
+os.environ.setdefault("FAIRTRACE_EMBED_CACHE", "1")
+# gRPC multiplexes the concurrent searches over one channel (port 6334);
+# set QDRANT_PREFER_GRPC=0 where only the REST port is reachable
+os.environ.setdefault("QDRANT_PREFER_GRPC", "1")
+
+import numpy as np
+import orjson
+from tqdm import tqdm
+
+from evaluation.metrics.llm_judge import cached_judge_call
+
 # Paths
 EVAL_DIR = Path(__file__).parent
 DATASET_FILE = EVAL_DIR / "regulation_golden_qa.json"
@@ -41,6 +55,10 @@ RESULTS_DIR.mkdir(exist_ok=True)
 
 # LLM Judge model (≤8B, runs locally via Ollama)
 JUDGE_MODEL = "qwen2.5:7b"  # Llama 3.1 8B - excellent for evaluation tasks
+JUDGE_KEEP_ALIVE = "30m"  # Keep the judge and its cached system prompt loaded between calls
+
+# Q&A pairs (RAG query + judge) in flight at once
+EVAL_CONCURRENCY = int(os.getenv("FAIRTRACE_EVAL_CONCURRENCY", "8"))
 
 
 # =============================================================================
@@ -85,6 +103,9 @@ def judge_answer_with_llm(
     """
     Use local Ollama LLM to judge answer quality.
     
+    Verdicts are stored in the LLM judge's response cache, keyed by the full
+    prompt, so reruns only judge answers that changed.
+    
     Args:
         question: The original question
         ground_truth: The expected answer
@@ -111,7 +132,7 @@ def judge_answer_with_llm(
 
 Evaluate the generated answer against the ground truth. Respond in JSON."""
 
-    try:
+    def call_judge() -> str:
         response = ollama.chat(
             model=model,
             messages=[
@@ -119,10 +140,14 @@ Evaluate the generated answer against the ground truth. Respond in JSON."""
                 {"role": "user", "content": user_prompt}
             ],
             format="json",
-            options={"temperature": 0.0}  # Deterministic evaluation
+            options={"temperature": 0.0},  # Deterministic evaluation
+            keep_alive=JUDGE_KEEP_ALIVE
         )
-        
-        return json.loads(response["message"]["content"])
+        return response["message"]["content"]
+    
+    try:
+        # Only well-formed verdicts are cached
+        return cached_judge_call(model, JUDGE_SYSTEM_PROMPT, user_prompt, call_judge, parse=orjson.loads)
         
     except Exception as e:
         print(f"⚠️ Judge error: {e}")
@@ -173,16 +198,91 @@ def calculate_mrr(
     return 0.0  # No match found
 
 
+def _pad_pages(rows: list[list[int]], fill: int, width: int | None = None) -> np.ndarray:
+    """Lay page lists out as a (rows x width) int matrix padded with fill (width >= 1)."""
+    width = max([1, *map(len, rows)]) if width is None else width
+    matrix = np.full((len(rows), width), fill, dtype=np.int64)
+    for i, row in enumerate(rows):
+        row = row[:width]
+        matrix[i, :len(row)] = row
+    return matrix
+
+
+def _page_hits(
+    expected_list: list[list[int]],
+    retrieved_list: list[list[int]],
+    k: int | None = None
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Relevant-rank matrix for a batch of queries.
+    
+    Pages are matched as (query, page) keys with a single np.isin, so the
+    cost grows with the number of ranks rather than ranks x expected pages.
+    
+    Returns:
+        keys: (queries x ranks) matrix of query * n_pages + page (top k ranks
+            only, if k is given; padding is -1)
+        hits: hits[i, r] is True if rank r + 1 of query i is an expected page
+        n_expected: Number of distinct expected pages per query
+        n_pages: Key stride (one past the highest page number)
+    """
+    n_queries = len(expected_list)
+    retrieved = _pad_pages(retrieved_list, fill=-1, width=k)
+    expected_pages = np.fromiter(
+        (page for pages in expected_list for page in pages), dtype=np.int64
+    )
+    expected_rows = np.repeat(np.arange(n_queries), [len(pages) for pages in expected_list])
+    n_pages = int(max(retrieved.max(initial=-1), expected_pages.max(initial=-1))) + 1
+    
+    # np.unique also drops repeated expected pages
+    expected_keys = np.unique(expected_rows * n_pages + expected_pages)
+    n_expected = np.bincount(expected_keys // n_pages, minlength=n_queries)
+    
+    valid = retrieved >= 0
+    keys = np.where(valid, np.arange(n_queries)[:, None] * n_pages + retrieved, -1)
+    hits = valid & np.isin(keys, expected_keys)
+    return keys, hits, n_expected, n_pages
+
+
+def recall_at_k_batch(
+    expected_list: list[list[int]],
+    retrieved_list: list[list[int]],
+    k: int
+) -> np.ndarray:
+    """calculate_recall_at_k for every query at once."""
+    keys, hits, n_expected, n_pages = _page_hits(expected_list, retrieved_list, k)
+    # Each expected page counts once, however often it is retrieved
+    found = np.bincount(np.unique(keys[hits]) // n_pages, minlength=len(expected_list))
+    return np.where(n_expected > 0, found / np.maximum(n_expected, 1), 1.0)
+
+
+def mrr_batch(
+    expected_list: list[list[int]],
+    retrieved_list: list[list[int]]
+) -> np.ndarray:
+    """calculate_mrr for every query at once."""
+    _, hits, n_expected, _ = _page_hits(expected_list, retrieved_list)
+    reciprocal_ranks = np.where(hits.any(axis=1), 1.0 / (hits.argmax(axis=1) + 1), 0.0)
+    return np.where(n_expected > 0, reciprocal_ranks, 1.0)
+
+
 # =============================================================================
 # RAG SYSTEM INTERFACE
 # =============================================================================
-def run_rag_query(question: str, rerank: bool = False) -> dict:
+def run_rag_query(
+    question: str,
+    rerank: bool = False,
+    *,
+    query_embedding: tuple[list[float], list[int], list[float]] | None = None
+) -> dict:
     """
     Run a query through the regulation agent and get response + retrieval info.
     
     Args:
         question: The question to ask
         rerank: If True, use mxbai reranker for two-stage retrieval
+        query_embedding: Pre-computed (dense, sparse indices, sparse values)
+            for question (optional)
     
     Returns:
         {
@@ -196,10 +296,12 @@ def run_rag_query(question: str, rerank: bool = False) -> dict:
     
     agent = get_regulation_agent()
     
-    start = time.time()
+    start = time.perf_counter_ns()
     
     # Get evidence (retrieval) with optional reranking
-    evidence, queries_tried, attempts = agent.search_with_retry(question, rerank=rerank)
+    evidence, queries_tried, attempts = agent.search_with_retry(
+        question, rerank=rerank, query_embedding=query_embedding
+    )
     
     # Extract retrieved pages
     retrieved_pages = []
@@ -214,7 +316,7 @@ def run_rag_query(question: str, rerank: bool = False) -> dict:
     # Generate answer
     response = agent.analyze(question, evidence, retrieval_attempts=attempts)
     
-    latency_ms = int((time.time() - start) * 1000)
+    latency_ms = (time.perf_counter_ns() - start) // 1_000_000
     
     return {
         "answer": response.get("answer", ""),
@@ -230,163 +332,245 @@ def run_rag_query(question: str, rerank: bool = False) -> dict:
 # =============================================================================
 # EVALUATION RUNNER
 # =============================================================================
+def evaluate_qa(
+    qa: dict,
+    rerank: bool = False,
+    retrieval_only: bool = False,
+    query_embedding: tuple[list[float], list[int], list[float]] | None = None
+) -> dict:
+    """
+    Run one Q&A pair through the RAG system and (unless retrieval_only) the judge.
+    
+    Returns the per-query result record, including its retrieval metrics.
+    """
+    question = qa["question"]
+    ground_truth = qa["answer"]
+    expected_pages = [c.get("page") for c in qa.get("citations", []) if c.get("page")]
+    
+    # Run RAG query
+    rag_result = run_rag_query(question, rerank=rerank, query_embedding=query_embedding)
+    retrieved_pages = rag_result["retrieved_pages"]
+    
+    # LLM Judge evaluation (unless retrieval-only)
+    judge_result = {}
+    if not retrieval_only:
+        judge_result = judge_answer_with_llm(
+            question=question,
+            ground_truth=ground_truth,
+            generated_answer=rag_result["answer"],
+            retrieved_context=rag_result["retrieved_context"]
+        )
+    
+    return {
+        "question": question,
+        "query_type": qa.get("query_type", "unknown"),
+        "difficulty": qa.get("difficulty", "unknown"),
+        "expected_pages": expected_pages,
+        "retrieved_pages": retrieved_pages,
+        "recall_at_5": calculate_recall_at_k(expected_pages, retrieved_pages, k=5),
+        "recall_at_10": calculate_recall_at_k(expected_pages, retrieved_pages, k=10),
+        "mrr": calculate_mrr(expected_pages, retrieved_pages),
+        "latency_ms": rag_result["latency_ms"],
+        "rag_confidence": rag_result["confidence"],
+        "ground_truth": ground_truth,
+        "generated_answer": rag_result["answer"],
+        "judge": judge_result
+    }
+
+
+async def _evaluate_all(
+    dataset: list[dict],
+    rerank: bool,
+    retrieval_only: bool,
+    embeddings: list[tuple[list[float], list[int], list[float]]],
+    on_result: Callable[[dict], None]
+):
+    """evaluate_qa for every pair, EVAL_CONCURRENCY at a time, passing each result to on_result as it completes."""
+    semaphore = asyncio.Semaphore(EVAL_CONCURRENCY)
+    
+    with tqdm(total=len(dataset), desc="Evaluating") as progress:
+        async def run(qa: dict, embedding: tuple):
+            async with semaphore:
+                result = await asyncio.to_thread(evaluate_qa, qa, rerank, retrieval_only, embedding)
+            on_result(result)  # On the event loop thread: no locking needed
+            judge = result["judge"]
+            if judge:
+                progress.set_postfix(judge=f"{judge.get('overall_score', 0)}/5 ({judge.get('verdict', '?')})")
+            progress.update()
+        
+        await asyncio.gather(*(run(qa, embedding) for qa, embedding in zip(dataset, embeddings)))
+
+
+# Fields of a saved result that --resume needs to rebuild the running sums
+_RESUME_FIELDS = ("query_type", "expected_pages", "retrieved_pages", "latency_ms", "judge")
+
+
+def _new_totals() -> dict:
+    return {
+        "count": 0,
+        "recall_at_5": 0.0,
+        "recall_at_10": 0.0,
+        "mrr": 0.0,
+        "latency_ms": 0.0,
+        "judge_score": 0.0,  # Over all queries (errors score 0)
+        "scored": 0,  # Queries with a non-zero judge score...
+        "scored_sum": 0.0,  # ...and their total
+        "passed": 0
+    }
+
+
+def _add_to_totals(totals: dict, result: dict):
+    """Add one result record to running sums."""
+    totals["count"] += 1
+    for name in ("recall_at_5", "recall_at_10", "mrr", "latency_ms"):
+        totals[name] += result[name]
+    
+    score = result["judge"].get("overall_score", 0)
+    totals["judge_score"] += score
+    if score:
+        totals["scored"] += 1
+        totals["scored_sum"] += score
+    if result["judge"].get("verdict") == "PASS":
+        totals["passed"] += 1
+
+
 def run_evaluation(
     dataset_path: Path = DATASET_FILE,
     limit: int | None = None,
     retrieval_only: bool = False,
     rerank: bool = False,
-    output_path: Path | None = None
+    output_path: Path | None = None,
+    resume: bool = False
 ) -> dict:
     """
     Run full evaluation on the dataset.
     
+    Per-query results are appended to output_path's .jsonl sibling as they
+    complete; only running sums are kept in memory.
+    
     Args:
         dataset_path: Path to the evaluation dataset JSON
         limit: Optional limit on number of queries
         retrieval_only: If True, skip LLM judge evaluation
         rerank: If True, use mxbai reranker for two-stage retrieval
         output_path: Optional output file path
+        resume: If True, keep the results already in the .jsonl file and
+            only evaluate the remaining questions
     
     Returns:
         Aggregated metrics dict
     """
     # Load dataset
-    with open(dataset_path, "r", encoding="utf-8") as f:
-        dataset = json.load(f)
+    dataset = orjson.loads(dataset_path.read_bytes())
     
     if limit:
         dataset = dataset[:limit]
     
-    print(f"📊 Evaluating {len(dataset)} Q&A pairs...")
-    
-    # Results storage
-    results = []
-    
-    # Aggregate metrics
-    recall_at_5_scores = []
-    recall_at_10_scores = []
-    mrr_scores = []
-    judge_scores = []
-    latencies = []
+    if output_path is None:
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        rerank_suffix = "_rerank" if rerank else ""
+        output_path = RESULTS_DIR / f"regulation_eval_{timestamp}{rerank_suffix}.json"
+    results_path = output_path.with_suffix(".jsonl")
     
-    # Per query-type metrics
+    # Running sums, overall and per query type
+    totals = _new_totals()
     by_type = {}
     
-    for i, qa in enumerate(dataset):
-        question = qa["question"]
-        ground_truth = qa["answer"]
-        expected_pages = [c.get("page") for c in qa.get("citations", []) if c.get("page")]
-        query_type = qa.get("query_type", "unknown")
-        difficulty = qa.get("difficulty", "unknown")
-        
-        print(f"\n[{i+1}/{len(dataset)}] {query_type} | {difficulty}")
-        print(f"   Q: {question[:80]}...")
-        
-        # Run RAG query
-        rag_result = run_rag_query(question, rerank=rerank)
-        
-        # Calculate retrieval metrics
-        retrieved_pages = rag_result["retrieved_pages"]
-        
-        r_at_5 = calculate_recall_at_k(expected_pages, retrieved_pages, k=5)
-        r_at_10 = calculate_recall_at_k(expected_pages, retrieved_pages, k=10)
-        mrr = calculate_mrr(expected_pages, retrieved_pages)
+    def record(result: dict):
+        _add_to_totals(totals, result)
+        _add_to_totals(by_type.setdefault(result["query_type"], _new_totals()), result)
+    
+    # Resume: count results already on disk and skip their questions
+    done = set()
+    ends_mid_record = False
+    if resume and results_path.exists():
+        questions = {qa["question"] for qa in dataset}
+        resumed = []
+        with open(results_path, "rb") as f:
+            for line in f:
+                ends_mid_record = not line.endswith(b"\n")
+                try:
+                    result = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Partial line from an interrupted run
+                if result["question"] in questions:
+                    done.add(result["question"])
+                    # Only what the totals need; answers and context stay on disk
+                    resumed.append({name: result[name] for name in _RESUME_FIELDS})
         
-        recall_at_5_scores.append(r_at_5)
-        recall_at_10_scores.append(r_at_10)
-        mrr_scores.append(mrr)
-        latencies.append(rag_result["latency_ms"])
-        
-        print(f"   Recall@5: {r_at_5:.2f} | Recall@10: {r_at_10:.2f} | MRR: {mrr:.2f}")
+        # Re-score the saved page lists in one batched pass
+        if resumed:
+            expected_list = [result["expected_pages"] for result in resumed]
+            retrieved_list = [result["retrieved_pages"] for result in resumed]
+            scores = {
+                "recall_at_5": recall_at_k_batch(expected_list, retrieved_list, k=5),
+                "recall_at_10": recall_at_k_batch(expected_list, retrieved_list, k=10),
+                "mrr": mrr_batch(expected_list, retrieved_list),
+            }
+            for i, result in enumerate(resumed):
+                for name, values in scores.items():
+                    result[name] = float(values[i])
+                record(result)
+        print(f"⏩ Resuming: {len(done)} questions already evaluated")
+    
+    pending = [qa for qa in dataset if qa["question"] not in done]
+    print(f"📊 Evaluating {len(pending)} Q&A pairs ({EVAL_CONCURRENCY} at a time)...")
+    
+    # Embed every question up front: one batched call per encoder
+    from tools.qdrant_retriever import embed_queries
+    embeddings = embed_queries([qa["question"] for qa in pending])
+    
+    with open(results_path, "ab" if resume else "wb") as results_file:
+        # Start on a fresh line if the last run stopped mid-record
+        if ends_mid_record:
+            results_file.write(b"\n")
         
-        # LLM Judge evaluation (unless retrieval-only)
-        judge_result = {}
-        if not retrieval_only:
-            judge_result = judge_answer_with_llm(
-                question=question,
-                ground_truth=ground_truth,
-                generated_answer=rag_result["answer"],
-                retrieved_context=rag_result["retrieved_context"]
-            )
-            
-            overall = judge_result.get("overall_score", 0)
-            verdict = judge_result.get("verdict", "?")
-            judge_scores.append(overall)
-            
-            print(f"   Judge: {overall}/5 ({verdict})")
+        def stream(result: dict):
+            results_file.write(orjson.dumps(result) + b"\n")
+            results_file.flush()
+            record(result)
         
-        # Store result
-        result = {
-            "question": question,
-            "query_type": query_type,
-            "difficulty": difficulty,
-            "expected_pages": expected_pages,
-            "retrieved_pages": retrieved_pages,
-            "recall_at_5": r_at_5,
-            "recall_at_10": r_at_10,
-            "mrr": mrr,
-            "latency_ms": rag_result["latency_ms"],
-            "rag_confidence": rag_result["confidence"],
-            "ground_truth": ground_truth,
-            "generated_answer": rag_result["answer"],
-            "judge": judge_result
-        }
-        results.append(result)
-        
-        # Track by type
-        if query_type not in by_type:
-            by_type[query_type] = {"recall_at_5": [], "recall_at_10": [], "mrr": [], "judge": []}
-        by_type[query_type]["recall_at_5"].append(r_at_5)
-        by_type[query_type]["recall_at_10"].append(r_at_10)
-        by_type[query_type]["mrr"].append(mrr)
-        if judge_result.get("overall_score"):
-            by_type[query_type]["judge"].append(judge_result["overall_score"])
+        # Each Q&A is an independent RAG + judge round trip: run them concurrently
+        asyncio.run(_evaluate_all(pending, rerank, retrieval_only, embeddings, stream))
     
     # Aggregate metrics
-    def safe_mean(lst):
-        return sum(lst) / len(lst) if lst else 0.0
+    def mean(data: dict, name: str) -> float:
+        return data[name] / data["count"] if data["count"] else 0.0
     
     metrics = {
-        "total_queries": len(dataset),
+        "total_queries": totals["count"],
         "overall": {
-            "recall_at_5": safe_mean(recall_at_5_scores),
-            "recall_at_10": safe_mean(recall_at_10_scores),
-            "mrr": safe_mean(mrr_scores),
-            "avg_latency_ms": safe_mean(latencies),
+            "recall_at_5": mean(totals, "recall_at_5"),
+            "recall_at_10": mean(totals, "recall_at_10"),
+            "mrr": mean(totals, "mrr"),
+            "avg_latency_ms": mean(totals, "latency_ms"),
         },
         "by_query_type": {
             qtype: {
-                "count": len(data["recall_at_5"]),
-                "recall_at_5": safe_mean(data["recall_at_5"]),
-                "recall_at_10": safe_mean(data["recall_at_10"]),
-                "mrr": safe_mean(data["mrr"]),
+                "count": data["count"],
+                "recall_at_5": mean(data, "recall_at_5"),
+                "recall_at_10": mean(data, "recall_at_10"),
+                "mrr": mean(data, "mrr"),
             }
             for qtype, data in by_type.items()
         },
-        "results": results
+        "results_file": str(results_path)
     }
     
-    if not retrieval_only and judge_scores:
-        metrics["overall"]["judge_score"] = safe_mean(judge_scores)
-        metrics["overall"]["pass_rate"] = len([r for r in results if r.get("judge", {}).get("verdict") == "PASS"]) / len(results)
+    if not retrieval_only and totals["count"]:
+        metrics["overall"]["judge_score"] = mean(totals, "judge_score")
+        metrics["overall"]["pass_rate"] = mean(totals, "passed")
         
         for qtype, data in by_type.items():
-            if data["judge"]:
-                metrics["by_query_type"][qtype]["judge_score"] = safe_mean(data["judge"])
-    
-    # Save results
-    if output_path is None:
-        timestamp = time.strftime("%Y%m%d_%H%M%S")
-        rerank_suffix = "_rerank" if rerank else ""
-        output_path = RESULTS_DIR / f"regulation_eval_{timestamp}{rerank_suffix}.json"
+            if data["scored"]:
+                metrics["by_query_type"][qtype]["judge_score"] = data["scored_sum"] / data["scored"]
     
     # Add rerank flag to metrics
     metrics["rerank_enabled"] = rerank
     
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(metrics, f, ensure_ascii=False, indent=2)
+    output_path.write_bytes(orjson.dumps(metrics, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
-    print(f"\n✓ Results saved to {output_path}")
+    print(f"\n✓ Results saved to {output_path} (per-query: {results_path})")
     
     return metrics
 
@@ -444,8 +628,13 @@ def main():
     parser.add_argument("--retrieval-only", action="store_true", help="Skip LLM judge evaluation")
     parser.add_argument("--rerank", action="store_true", help="Enable mxbai reranker for two-stage retrieval")
     parser.add_argument("--output", type=str, default=None, help="Output file path")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run (requires --output)")
     args = parser.parse_args()
     
+    # Without --output a new timestamped file is created, so nothing would resume
+    if args.resume and not args.output:
+        parser.error("--resume requires --output")
+    
     dataset_path = Path(args.dataset)
     output_path = Path(args.output) if args.output else None
     
@@ -468,7 +657,8 @@ def main():
         limit=args.limit,
         retrieval_only=args.retrieval_only,
         rerank=args.rerank,
-        output_path=output_path
+        output_path=output_path,
+        resume=args.resume
     )
     
     # Print summary
@@ -10,21 +10,48 @@ Uses async execution for true parallelism.
 """
 
 import json
+import os
 import sys
 import asyncio
+import hashlib
+import threading
+from collections import Counter, OrderedDict
 from datetime import datetime
 from typing import TypedDict
 from pathlib import Path
 
+import orjson
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from langgraph.graph import StateGraph, START, END
 from langchain_core.runnables import RunnableConfig
+from langchain_openai import ChatOpenAI
 
+from agents.base_agent import LLM_MODEL, LLM_TEMPERATURE, llm_json
 from agents.risk_agent import RiskAgent
 from agents.fairness_agent import FairnessAgent
 from agents.trajectory_agent import TrajectoryAgent
 
+# Optional orchestrator race, e.g. FAIRTRACE_ORCHESTRATOR_MODELS="gpt-4o-mini,
+# gpt-4.1-nano": every model synthesizes concurrently, the first valid JSON
+# wins and the other calls are cancelled. Defaults to the agents' model alone.
+ORCHESTRATOR_MODELS = [
+    model.strip() for model in os.getenv("FAIRTRACE_ORCHESTRATOR_MODELS", "").split(",") if model.strip()
+] or [LLM_MODEL]
+
+# Seconds to wait for a synthesis before deciding by majority vote instead.
+# Applies when set, or when several models race (30s by default); a single
+# model is otherwise awaited however long it takes.
+ORCHESTRATOR_TIMEOUT: float | None = (
+    float(os.environ["FAIRTRACE_ORCHESTRATOR_TIMEOUT"]) if os.getenv("FAIRTRACE_ORCHESTRATOR_TIMEOUT")
+    else 30.0 if len(ORCHESTRATOR_MODELS) > 1 else None
+)
+
+VALID_DECISIONS = {"APPROVE", "REJECT", "CONDITIONAL", "ESCALATE"}
+
+_orchestrator_llms: dict[str, ChatOpenAI] = {}
+
 
 # =============================================================================
 # STATE DEFINITION
@@ -50,44 +77,172 @@ class CreditDecisionState(TypedDict):
     error: str | None
 
 
+# =============================================================================
+# AGENT SINGLETONS
+# =============================================================================
+# Agents keep no per-run state (LLM clients and the query parser are shared
+# module-level objects), so one instance of each serves every decision.
+_risk_agent: RiskAgent | None = None
+_fairness_agent: FairnessAgent | None = None
+_trajectory_agent: TrajectoryAgent | None = None
+
+
+def _get_risk_agent() -> RiskAgent:
+    global _risk_agent
+    if _risk_agent is None:
+        _risk_agent = RiskAgent()
+    return _risk_agent
+
+
+def _get_fairness_agent() -> FairnessAgent:
+    global _fairness_agent
+    if _fairness_agent is None:
+        _fairness_agent = FairnessAgent()
+    return _fairness_agent
+
+
+def _get_trajectory_agent() -> TrajectoryAgent:
+    global _trajectory_agent
+    if _trajectory_agent is None:
+        _trajectory_agent = TrajectoryAgent()
+    return _trajectory_agent
+
+
+# =============================================================================
+# DECISION CACHE
+# =============================================================================
+# Orchestrator syntheses keyed by a hash of the exact prompt: a decision is
+# only reused when the application and every verdict field the orchestrator
+# reads are identical, so its reasoning always matches the verdicts shown.
+DECISION_CACHE_SIZE = 10_000
+_decision_cache: OrderedDict[str, bytes] = OrderedDict()
+_decision_cache_lock = threading.Lock()
+
+
+def _decision_cache_key(system_prompt: str, user_message: str) -> str:
+    """Content hash of everything that determines the synthesis."""
+    # NUL separators keep ("ab", "c") and ("a", "bc") apart
+    key_data = "\0".join((",".join(ORCHESTRATOR_MODELS), system_prompt, user_message))
+    return hashlib.sha256(key_data.encode()).hexdigest()
+
+
+def _get_cached_decision(key: str) -> dict | None:
+    """Cached synthesis for key (a fresh dict), or None."""
+    with _decision_cache_lock:
+        data = _decision_cache.get(key)
+        if data is None:
+            return None
+        _decision_cache.move_to_end(key)
+    return orjson.loads(data)
+
+
+def _cache_decision(key: str, final: dict):
+    """Store a synthesis, evicting the least recently used past DECISION_CACHE_SIZE."""
+    with _decision_cache_lock:
+        _decision_cache[key] = orjson.dumps(final)
+        _decision_cache.move_to_end(key)
+        while len(_decision_cache) > DECISION_CACHE_SIZE:
+            _decision_cache.popitem(last=False)
+
+
+# =============================================================================
+# ORCHESTRATOR SYNTHESIS
+# =============================================================================
+def _get_orchestrator_llm(model: str) -> ChatOpenAI:
+    """JSON-mode client for model (the agents' shared client for LLM_MODEL)."""
+    if model == LLM_MODEL:
+        return llm_json
+    if model not in _orchestrator_llms:
+        _orchestrator_llms[model] = ChatOpenAI(
+            model=model,
+            temperature=LLM_TEMPERATURE,
+            api_key=os.getenv("OPENAI_API_KEY"),
+            model_kwargs={"response_format": {"type": "json_object"}}
+        )
+    return _orchestrator_llms[model]
+
+
+async def _race_synthesis(messages: list, config: RunnableConfig) -> dict:
+    """
+    First valid JSON synthesis from ORCHESTRATOR_MODELS.
+    
+    A model that errors or returns invalid JSON drops out of the race. With
+    one model and no ORCHESTRATOR_TIMEOUT, this is a single awaited call.
+    
+    Raises:
+        asyncio.TimeoutError: No valid synthesis within ORCHESTRATOR_TIMEOUT
+        Exception: The last model error, if every model failed
+    """
+    if len(ORCHESTRATOR_MODELS) == 1 and ORCHESTRATOR_TIMEOUT is None:
+        response = await _get_orchestrator_llm(ORCHESTRATOR_MODELS[0]).ainvoke(messages, config=config)
+        return orjson.loads(response.content)
+    
+    tasks = [
+        asyncio.create_task(_get_orchestrator_llm(model).ainvoke(messages, config=config))
+        for model in ORCHESTRATOR_MODELS
+    ]
+    error = None
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=ORCHESTRATOR_TIMEOUT):
+            try:
+                response = await next_done
+                return orjson.loads(response.content)
+            except asyncio.TimeoutError:
+                raise
+            except Exception as e:
+                error = e
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _majority_decision(risk: dict, fairness: dict, trajectory: dict, reason: str) -> dict:
+    """Rule-based synthesis: the recommendation at least two agents share, else ESCALATE."""
+    recommendations = {
+        "Risk": risk.get("recommendation"),
+        "Fairness": fairness.get("recommendation"),
+        "Trajectory": trajectory.get("recommendation"),
+    }
+    recommendation, votes = Counter(recommendations.values()).most_common(1)[0]
+    decision = recommendation if votes >= 2 and recommendation in VALID_DECISIONS else "ESCALATE"
+    votes_text = ", ".join(f"{agent}: {rec or 'N/A'}" for agent, rec in recommendations.items())
+    
+    return {
+        "decision": decision,
+        "confidence": "LOW",
+        "risk_level": risk.get("risk_level") or "MEDIUM",
+        "reasoning": f"{reason}; decided by majority vote of the agent recommendations ({votes_text}).",
+        "key_factors": [],
+        "conditions": []
+    }
+
+
 # =============================================================================
 # AGENT NODES (Async-compatible)
 # =============================================================================
 async def risk_node(state: CreditDecisionState) -> dict:
-    """Run the Risk Agent (async wrapper for CPU-bound work)."""
+    """Run the Risk Agent (LLM call on the event loop, search in a thread)."""
     try:
-        # Run in thread pool to not block event loop
-        def run_agent():
-            agent = RiskAgent()
-            return agent.run(state["application"])
-        
-        verdict = await asyncio.to_thread(run_agent)
+        verdict = await _get_risk_agent().arun(state["application"])
         return {"risk_verdict": verdict}
     except Exception as e:
         return {"risk_verdict": {"error": str(e), "recommendation": "ESCALATE"}}
 
 
 async def fairness_node(state: CreditDecisionState) -> dict:
-    """Run the Fairness Agent (async wrapper for CPU-bound work)."""
+    """Run the Fairness Agent (LLM call on the event loop, search in a thread)."""
     try:
-        def run_agent():
-            agent = FairnessAgent()
-            return agent.run(state["application"])
-        
-        verdict = await asyncio.to_thread(run_agent)
+        verdict = await _get_fairness_agent().arun(state["application"])
         return {"fairness_verdict": verdict}
     except Exception as e:
         return {"fairness_verdict": {"error": str(e), "recommendation": "ESCALATE"}}
 
 
 async def trajectory_node(state: CreditDecisionState) -> dict:
-    """Run the Trajectory Agent (async wrapper for CPU-bound work)."""
+    """Run the Trajectory Agent (LLM call on the event loop, search in a thread)."""
     try:
-        def run_agent():
-            agent = TrajectoryAgent()
-            return agent.run(state["application"])
-        
-        verdict = await asyncio.to_thread(run_agent)
+        verdict = await _get_trajectory_agent().arun(state["application"])
         return {"trajectory_verdict": verdict}
     except Exception as e:
         return {"trajectory_verdict": {"error": str(e), "recommendation": "ESCALATE"}}
@@ -95,7 +250,6 @@ async def trajectory_node(state: CreditDecisionState) -> dict:
 
 async def orchestrator_node(state: CreditDecisionState) -> dict:
     """Synthesize final decision from agent verdicts."""
-    from agents.base_agent import llm_json
     from langchain_core.messages import SystemMessage, HumanMessage
     import uuid
     
@@ -143,19 +297,28 @@ TRAJECTORY AGENT:
 - Reasoning: {trajectory.get('reasoning', 'N/A')[:500]}
 """
     
+    # Verdicts from failed agents are placeholders - don't cache on them
+    cacheable = not any("error" in verdict for verdict in (risk, fairness, trajectory))
+    
     try:
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Application: {json.dumps(state['application'])}\n\n{verdicts_summary}\n\nMake final decision as JSON.")
-        ]
-        config = RunnableConfig(run_name="Orchestrator_final_decision")
-        
-        # Run LLM call in thread to not block
-        def call_llm():
-            return llm_json.invoke(messages, config=config)
+        user_message = f"Application: {json.dumps(state['application'])}\n\n{verdicts_summary}\n\nMake final decision as JSON."
+        cache_key = _decision_cache_key(system_prompt, user_message)
+        final = _get_cached_decision(cache_key) if cacheable else None
         
-        response = await asyncio.to_thread(call_llm)
-        final = json.loads(response.content)
+        if final is None:
+            messages = [
+                SystemMessage(content=system_prompt),
+                HumanMessage(content=user_message)
+            ]
+            config = RunnableConfig(run_name="Orchestrator_final_decision")
+            final = await _race_synthesis(messages, config)
+            if cacheable:
+                _cache_decision(cache_key, final)
+    except asyncio.TimeoutError:
+        final = _majority_decision(
+            risk, fairness, trajectory,
+            f"No synthesis within {ORCHESTRATOR_TIMEOUT:g}s"
+        )
     except Exception as e:
         final = {
             "decision": "ESCALATE",
@@ -22,7 +22,10 @@ import hashlib
 import os
 import re
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -38,6 +41,12 @@ from qdrant_client.http import models
 from qdrant_client.http.exceptions import ResponseHandlingException
 from tqdm import tqdm
 
+try:
+    import re2  # google-re2: linear-time DFA matching
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 load_dotenv()
 
 # --- Configuration ---
@@ -62,6 +71,8 @@ TARGET_CHUNK_CHARS = 600  # ~150 words, ~2-3 sentences
 MAX_CHUNK_CHARS = 1200   # Upper limit
 
 BATCH_SIZE = 25
+EMBED_BATCH_SIZE = 64  # Chunks per dense + sparse embedding call
+UPLOADS_IN_FLIGHT = 4  # Upsert batches queued behind embedding before it waits
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
 
@@ -93,6 +104,45 @@ except Exception as e:
     print("✓ Fallback RecursiveChunker initialized")
 
 
+def _compile(pattern: str, flags: int = 0):
+    """
+    Compile with RE2 when installed, falling back to the stdlib engine.
+    
+    RE2 scans each page in linear time instead of backtracking. Its \\s is
+    ASCII-only, so it is widened to the Unicode space separators Python
+    matches (PDF text is full of non-breaking spaces: "Article\\xa05").
+    """
+    if RE2_AVAILABLE:
+        options = re2.Options()
+        options.case_sensitive = not flags & re.IGNORECASE
+        return re2.compile(pattern.replace(r'\s', r'[\s\p{Zs}]'), options)
+    return re.compile(pattern, flags)
+
+
+# Compiled once: applied to every page and chunk
+_TABLE_HINT_RE = _compile(r'\t{2,}|\s{4,}\d')  # Tab-separated or aligned numbers
+_BLANK_LINES_RE = _compile(r'\n{3,}')
+_HEADING_RE = _compile(r'^(Article|Section|Chapitre|Titre)', re.IGNORECASE)
+_BOUNDARY_RE = _compile(r'(Article\s+\d+|Circulaire\s+(?:aux\s+banques\s+)?n[°o]?)')
+_TABLE_CELL_RE = _compile(r'\t|\|')
+
+# Article/section references, most specific first (the first pattern found wins)
+_ARTICLE_PATTERNS = [
+    _compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'(Article\s+\d+[\.-]?\d*)',
+        r'(Art\.\s*\d+[\.-]?\d*)',
+        r'(Section\s+\d+[\.\d]*)',
+        r'(Chapitre\s+\d+)',
+        r'(Titre\s+[IVX]+)',
+        r'(Circulaire\s+(?:aux\s+banques\s+)?n[°o]?\s*\d{2,4}[\-/]\d+)',
+        r'(Note\s+(?:aux\s+(?:banques|établissements)\s+)?n[°o]?\s*\d+)',
+        r'(Décret\s+n[°o]?\s*\d{4}[\-/]\d+)',
+        r'(Loi\s+n[°o]?\s*\d{4}[\-/]\d+)',
+    )
+]
+
+
 # =============================================================================
 # PDF EXTRACTION
 # =============================================================================
@@ -114,10 +164,10 @@ def extract_pdf_pages(pdf_path: Path) -> list[dict]:
         text = page.get_text("text")
         
         # Heuristic: detect tables by looking for tab-separated or aligned content
-        has_tables = bool(re.search(r'\t{2,}|\s{4,}\d', text))
+        has_tables = bool(_TABLE_HINT_RE.search(text))
         
         # Clean up text
-        text = re.sub(r'\n{3,}', '\n\n', text)  # Collapse multiple newlines
+        text = _BLANK_LINES_RE.sub('\n\n', text)  # Collapse multiple newlines
         text = text.strip()
         
         if text:  # Only include non-empty pages
@@ -137,20 +187,8 @@ def extract_article_reference(text: str) -> str | None:
     Extract article/section reference from text.
     Improved patterns for Tunisian banking regulations.
     """
-    patterns = [
-        r'(Article\s+\d+[\.-]?\d*)',
-        r'(Art\.\s*\d+[\.-]?\d*)',
-        r'(Section\s+\d+[\.\d]*)',
-        r'(Chapitre\s+\d+)',
-        r'(Titre\s+[IVX]+)',
-        r'(Circulaire\s+(?:aux\s+banques\s+)?n[°o]?\s*\d{2,4}[\-/]\d+)',
-        r'(Note\s+(?:aux\s+(?:banques|établissements)\s+)?n[°o]?\s*\d+)',
-        r'(Décret\s+n[°o]?\s*\d{4}[\-/]\d+)',
-        r'(Loi\s+n[°o]?\s*\d{4}[\-/]\d+)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for pattern in _ARTICLE_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1).strip()
     return None
@@ -169,7 +207,7 @@ def extract_section_title(text: str) -> str | None:
     # Check if first line looks like a heading (short, possibly uppercase, no period at end)
     if (len(first_line) < 150 and 
         not first_line.endswith('.') and
-        (first_line.isupper() or re.match(r'^(Article|Section|Chapitre|Titre)', first_line, re.IGNORECASE))):
+        (first_line.isupper() or _HEADING_RE.match(first_line))):
         return first_line
     
     return None
@@ -203,8 +241,7 @@ def chunk_pages(pages: list[dict]) -> list[dict]:
         has_tables = page["has_tables"]
         
         # Pre-process: add paragraph breaks at article boundaries
-        text = re.sub(r'(Article\s+\d+)', r'\n\n\1', text)
-        text = re.sub(r'(Circulaire\s+(?:aux\s+banques\s+)?n[°o]?)', r'\n\n\1', text)
+        text = _BOUNDARY_RE.sub(r'\n\n\1', text)
         
         # Use Chonkie to chunk the page text
         try:
@@ -239,7 +276,7 @@ def chunk_pages(pages: list[dict]) -> list[dict]:
                 current_section = section_title
             
             # Determine chunk type
-            chunk_type = "table" if has_tables and re.search(r'\t|\|', chunk_text) else "text"
+            chunk_type = "table" if has_tables and _TABLE_CELL_RE.search(chunk_text) else "text"
             
             all_chunks.append({
                 "chunk_id": chunk_id,
@@ -292,12 +329,44 @@ def embed_dense(text: str) -> list[float]:
         return [0.0] * DENSE_DIM
 
 
+def embed_dense_batch(texts: list[str]) -> list[list[float]]:
+    """
+    Dense embeddings for many texts in one Ollama call.
+    
+    Same truncation and zero vectors for empty texts as embed_dense; if the
+    batch call fails, texts are embedded one by one so a single bad text
+    doesn't zero the whole batch.
+    """
+    texts = [text[:MAX_EMBED_CHARS].strip() for text in texts]
+    vectors = [[0.0] * DENSE_DIM for _ in texts]
+    
+    non_empty = [i for i, text in enumerate(texts) if text]
+    if not non_empty:
+        return vectors
+    
+    try:
+        response = ollama.embed(model=DENSE_MODEL, input=[texts[i] for i in non_empty])
+        for i, vector in zip(non_empty, response["embeddings"]):
+            vectors[i] = vector
+    except Exception as e:
+        print(f"\n⚠️ Batch embedding error: {e} - embedding one by one")
+        for i in non_empty:
+            vectors[i] = embed_dense(texts[i])
+    
+    return vectors
+
+
 def embed_sparse(text: str) -> tuple[list[int], list[float]]:
     """Generate sparse embedding using FastEmbed BM42."""
-    embeddings = list(sparse_encoder.embed([text]))[0]
-    indices = embeddings.indices.tolist()
-    values = embeddings.values.tolist()
-    return indices, values
+    return embed_sparse_batch([text])[0]
+
+
+def embed_sparse_batch(texts: list[str]) -> list[tuple[list[int], list[float]]]:
+    """Sparse embeddings for many texts, one BM42 forward pass per EMBED_BATCH_SIZE texts."""
+    return [
+        (embedding.indices.tolist(), embedding.values.tolist())
+        for embedding in sparse_encoder.embed(texts, batch_size=EMBED_BATCH_SIZE)
+    ]
 
 
 # =============================================================================
@@ -394,6 +463,19 @@ def ingest_chunks(
         if current_count >= len(chunks):
             print(f"\n✓ {COLLECTION_NAME} already complete ({current_count} points)")
             return
+        
+        # Points are uploaded in ID order, so the collection is the checkpoint.
+        # Skipping by count assumes this run chunked the PDF exactly like the
+        # interrupted one (it won't if e.g. the chunker fell back): check the
+        # last stored point against our chunk list before trusting it.
+        expected_id = chunks[current_count - 1]["chunk_id"]
+        stored = client.retrieve(COLLECTION_NAME, ids=[current_count], with_payload=["chunk_id"])
+        stored_id = stored[0].payload.get("chunk_id") if stored else None
+        if stored_id != expected_id:
+            print(f"\n❌ Cannot resume: point {current_count} is {stored_id}, expected {expected_id}")
+            print("   Chunking differs from the interrupted run - re-run without --resume")
+            return
+        
         print(f"\n⏩ Resuming: {current_count}/{len(chunks)} already ingested")
         chunks = chunks[current_count:]
         start_id = current_count + 1
@@ -402,40 +484,72 @@ def ingest_chunks(
     
     print(f"\nIngesting {len(chunks)} chunks into {COLLECTION_NAME}...")
     
+    # Pipeline: the dense (Ollama) and sparse (BM42) embeddings of a batch
+    # run side by side, and upserts go to a single upload thread so the
+    # network overlaps the next batch's embedding. One upload thread keeps
+    # points landing in ID order, which --resume relies on.
+    upload_failed = threading.Event()
+    
+    def upload(batch_points: list):
+        if upload_failed.is_set():
+            return  # An earlier batch failed: don't leave a gap behind it
+        try:
+            upsert_with_retry(client, batch_points)
+        except Exception:
+            upload_failed.set()
+            raise
+    
     points = []
-    for i, chunk in enumerate(tqdm(chunks, desc=f"Processing chunks")):
-        # Generate embeddings
-        content_vec = embed_dense(chunk["content"])
-        sparse_indices, sparse_values = embed_sparse(chunk["content"])
-        
-        point = models.PointStruct(
-            id=start_id + i,
-            vector={
-                "content": content_vec,
-                "keywords": models.SparseVector(
-                    indices=sparse_indices,
-                    values=sparse_values
+    uploads = deque()
+    progress = tqdm(total=len(chunks), desc="Processing chunks")
+    with ThreadPoolExecutor(max_workers=1) as dense_pool, ThreadPoolExecutor(max_workers=1) as upload_pool:
+        for start in range(0, len(chunks), EMBED_BATCH_SIZE):
+            # One dense and one sparse call per embedding batch
+            batch = chunks[start:start + EMBED_BATCH_SIZE]
+            texts = [chunk["content"] for chunk in batch]
+            dense_future = dense_pool.submit(embed_dense_batch, texts)
+            sparse_vecs = embed_sparse_batch(texts)
+            content_vecs = dense_future.result()
+            
+            for offset, chunk in enumerate(batch):
+                sparse_indices, sparse_values = sparse_vecs[offset]
+                point = models.PointStruct(
+                    id=start_id + start + offset,
+                    vector={
+                        "content": content_vecs[offset],
+                        "keywords": models.SparseVector(
+                            indices=sparse_indices,
+                            values=sparse_values
+                        )
+                    },
+                    payload={
+                        "chunk_id": chunk["chunk_id"],
+                        "content": chunk["content"],
+                        "page_number": chunk["page_number"],
+                        "article_ref": chunk["article_ref"],
+                        "section_title": chunk["section_title"],
+                        "chunk_type": chunk["chunk_type"],
+                        "char_count": chunk["char_count"],
+                        "source": "reg_bancaire.pdf"
+                    }
                 )
-            },
-            payload={
-                "chunk_id": chunk["chunk_id"],
-                "content": chunk["content"],
-                "page_number": chunk["page_number"],
-                "article_ref": chunk["article_ref"],
-                "section_title": chunk["section_title"],
-                "chunk_type": chunk["chunk_type"],
-                "char_count": chunk["char_count"],
-                "source": "reg_bancaire.pdf"
-            }
-        )
-        points.append(point)
+                points.append(point)
+                
+                if len(points) >= BATCH_SIZE:
+                    uploads.append(upload_pool.submit(upload, points))
+                    points = []
+            
+            # Backpressure: surfaces upload errors and bounds queued points
+            while len(uploads) > UPLOADS_IN_FLIGHT:
+                uploads.popleft().result()
+            
+            progress.update(len(batch))
         
-        if len(points) >= BATCH_SIZE:
-            upsert_with_retry(client, points)
-            points = []
-    
-    if points:
-        upsert_with_retry(client, points)
+        if points:
+            uploads.append(upload_pool.submit(upload, points))
+        while uploads:
+            uploads.popleft().result()
+    progress.close()
     
     final_count = client.count(COLLECTION_NAME).count
     print(f"✓ Ingested {len(chunks)} chunks (total: {final_count})")